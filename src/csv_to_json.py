@@ -10,6 +10,21 @@
 ---Version 0.2.0---
 @Time           : 2024/01/22
 @Description    : 添加命令行支持
+---Version 0.3.0---
+@Time           : 2026/10/18
+@Description    : 逐行流式写出 records，内存占用与文件大小无关，添加 --compact
+---Version 0.4.0---
+@Time           : 2026/10/18
+@Description    : 添加 --format ndjson，mmap 分块后用进程池并行转换
+---Version 0.5.0---
+@Time           : 2026/10/18
+@Description    : 按扩展名直接读写 .gz/.zst 压缩文件，添加 --level/--threads
+---Version 0.6.0---
+@Time           : 2026/10/18
+@Description    : 添加 --layout columns，按块向量化推断列类型，可输出 .npz
+---Version 0.7.0---
+@Time           : 2026/10/18
+@Description    : 添加 --columns/--where，在读取循环中投影和过滤，输出统计信息
 '''
 __Author__ = "ZouZhao"
 __Version__ = "0.1.0"
@@ -17,10 +32,62 @@ __License__ = "Copyright (c) 2023 by zouzhao, All Rights Reserved."
 __Name__ = "CsvToJson"
 __Description__ = "csv to json"
 
+import io
 import os
+import re
 import csv
+import gzip
 import json
+import mmap
+import time
+import pickle
+import zipfile
 import argparse
+import tempfile
+import contextlib
+import operator
+from itertools import islice
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, TextIO, Tuple
+
+import pyzstd
+import numpy as np
+
+# 按扩展名识别的压缩格式
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+# --where 支持的比较运算，两个字符的要排在前面
+WHERE_PATTERN = re.compile(r"\s*(.+?)\s*(==|!=|<=|>=|<|>)\s*(.*?)\s*$", re.S)
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+# csv 默认方言的一个字段：只有开头的引号才开始引号字段，字段内 "" 是转义，
+# 闭合引号后和非引号字段里的引号都是普通字符。写法没有歧义，不会回溯出错
+CSV_FIELD = rb'(?:"[^"]*(?:""[^"]*)*"(?!")|(?!"))[^,\r\n]*'
+CSV_FIELDS = re.compile(rb"(?:%s[,\r\n])*" % CSV_FIELD)
+CSV_RECORD_END = re.compile(rb"(?:%s[,\r])*%s\n" % (CSV_FIELD, CSV_FIELD))
+
+# 识别为布尔值的写法，逐个比较比先转小写快得多
+TRUE_VALUES = ("true", "True", "TRUE")
+BOOL_VALUES = TRUE_VALUES + ("false", "False", "FALSE")
+
+# 比这更长的值一律按 str 处理，推断时的定宽数组不会因个别长值而膨胀
+MAX_NUMBER_LEN = 64
+
+# 列类型写入 .npz 时的 dtype，str 列另存为字节和偏移，见 write_text
+NPZ_DTYPES = {
+    "null": np.float64,
+    "bool": np.bool_,
+    "int": np.int64,
+    "float": np.float64,
+}
 
 
 def get_version() -> str:
@@ -32,25 +99,757 @@ def get_version() -> str:
     print(f"{__Author__} {__Name__} {__Version__} \n{__License__}")
 
 
-def convert(in_file: str, out_file: str):
-    """csv 转 json
+def is_compressed(path: str) -> bool:
+    """是否是 .gz 或 .zst 压缩文件
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        bool: 扩展名是压缩格式时为 True
+    """
+    return path.lower().endswith(COMPRESSED_SUFFIXES)
+
+
+def open_file(path: str,
+              mode: str = "r",
+              level: int = None,
+              threads: int = None,
+              newline: str = None) -> TextIO:
+    """以 utf-8 文本方式打开文件，.gz/.zst 按扩展名透明压缩和解压
+
+    Args:
+        path (str): 文件路径
+        mode (str, optional): "r" 或 "w". 默认为 "r".
+        level (int, optional): 写出时的压缩级别，gzip 为 0-9，zstd 最高 22.
+            默认为各格式的默认级别.
+        threads (int, optional): zstd 写出时的压缩线程数，gzip 不支持.
+            默认为单线程.
+        newline (str, optional): 同 open 的 newline. 默认为 None.
+
+    Returns:
+        TextIO: 文本流
+    """
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        kwargs = {}
+        if mode == "w" and level is not None:
+            kwargs["compresslevel"] = level
+        return gzip.open(path, mode + "t", encoding="utf-8", newline=newline,
+                         **kwargs)
+    if lower.endswith(".zst"):
+        option = {}
+        if mode == "w":
+            if level is not None:
+                option[pyzstd.CParameter.compressionLevel] = level
+            if threads:
+                option[pyzstd.CParameter.nbWorkers] = threads
+        return pyzstd.open(path, mode + "t", level_or_option=option or None,
+                           encoding="utf-8", newline=newline)
+    return open(path, mode, encoding="utf-8", newline=newline)
+
+
+def parse_where(expression: str) -> Tuple[str, Callable[[str], bool]]:
+    """解析 --where 条件 "列 运算符 值"，如 "age >= 18"、"city == 'New York'"
+
+    值是数字时按数值比较，无法转为数字的字段不满足条件；值加了引号或不是数字时
+    按字符串比较。
+
+    Args:
+        expression (str): 条件表达式，运算符为 == != < <= > >=
+
+    Raises:
+        ValueError: 表达式无法解析时抛出
+
+    Returns:
+        Tuple[str, Callable[[str], bool]]: (列名, 判断字段值的函数)
+    """
+    match = WHERE_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"{expression!r} is an invalid condition,"
+                         "must be 'column operator value'")
+    column, symbol, value = match.groups()
+    compare = OPERATORS[symbol]
+
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        value = value[1:-1]
+    else:
+        try:
+            number = float(value)
+        except ValueError:
+            pass
+        else:
+
+            def test(field: str) -> bool:
+                try:
+                    return compare(float(field), number)
+                except (TypeError, ValueError):
+                    return False
+
+            return column, test
+
+    def test(field: str) -> bool:
+        return field is not None and compare(field, value)
+
+    return column, test
+
+
+def select_rows(reader: Iterable[list],
+                header: list,
+                columns: list = None,
+                where: str = None,
+                restval: str = None,
+                stats: dict = None) -> Tuple[list, Iterator[tuple]]:
+    """在读取循环中按 --columns 投影、按 --where 过滤，只取出需要的字段
+
+    列数不足的行用 restval 补齐，多余的字段丢弃，重名的列取最后一个，
+    与 DictReader 一致。
+
+    Args:
+        reader (Iterable[list]): csv.reader，已读过表头
+        header (list): 表头
+        columns (list, optional): 要保留的列，按给出的顺序，重复的只保留一个.
+            默认为全部列.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+        restval (str, optional): 缺失字段的值. 默认为 None.
+        stats (dict, optional): 传入时在读完后累加 rows_read 读取的行数.
+            默认为 None.
+
+    Raises:
+        KeyError: 列名不在表头中时抛出
+
+    Returns:
+        Tuple[list, Iterator[tuple]]: (列名, 每行所选字段的元组)
+    """
+    positions = {name: i for i, name in enumerate(header)}
+    names = list(dict.fromkeys(columns or positions))
+    test = None
+    if where:
+        column, test = parse_where(where)
+        names_used = names + [column]
+    else:
+        names_used = names
+    for name in names_used:
+        if name not in positions:
+            raise KeyError(f"column {name!r} is not in the header")
+
+    indices = [positions[name] for name in names]
+    if len(indices) == 1:
+        # 只有一个下标时 itemgetter 返回的不是元组
+        index = indices[0]
+
+        def getter(row: list) -> tuple:
+            return (row[index], )
+    else:
+        getter = operator.itemgetter(*indices) if indices else (
+            lambda row: ())
+    test_index = positions[column] if test else None
+    width = len(header)
+
+    def rows() -> Iterator[tuple]:
+        read = 0
+        try:
+            for row in reader:
+                # 和 DictReader 一样跳过空行
+                if not row:
+                    continue
+                read += 1
+                # 缺失的字段按 None 判断，不受 restval 影响
+                if test is not None and not test(
+                        row[test_index] if test_index < len(row) else None):
+                    continue
+                if len(row) < width:
+                    row += [restval] * (width - len(row))
+                yield getter(row)
+        finally:
+            if stats is not None:
+                stats["rows_read"] = stats.get("rows_read", 0) + read
+
+    return names, rows()
+
+
+def read_records(csv_obj: TextIO,
+                 fieldnames: list = None,
+                 columns: list = None,
+                 where: str = None,
+                 stats: dict = None) -> Iterable[dict]:
+    """逐行读出 dict，没有 --columns/--where 时就是 DictReader
+
+    Args:
+        csv_obj (TextIO): csv 文本流
+        fieldnames (list, optional): 表头. 默认为读取第一行.
+        columns (list, optional): 要保留的列，见 select_rows. 默认为 None.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+        stats (dict, optional): 见 select_rows. 默认为 None.
+
+    Returns:
+        Iterable[dict]: 行
+    """
+    if not columns and not where:
+        return csv.DictReader(csv_obj, fieldnames)
+
+    reader = csv.reader(csv_obj)
+    if fieldnames is None:
+        fieldnames = next(reader, [])
+    names, rows = select_rows(reader, fieldnames, columns, where, stats=stats)
+    return (dict(zip(names, values)) for values in rows)
+
+
+def write_records(rows: Iterable[dict], json_obj: TextIO,
+                  compact: bool = False) -> int:
+    """逐行写出 {"records": [...]} 文档，不在内存中保留已写出的行
+
+    缩进模式的输出与 json.dump(..., indent=4) 逐字节一致：每行单独编码后
+    把换行替换为换行加两级缩进。
+
+    Args:
+        rows (Iterable[dict]): csv.DictReader 的行，值为字符串或 None，
+            只有键 None 对应多余字段的列表
+        json_obj (TextIO): 输出流
+        compact (bool, optional): 不缩进、不带空格. 默认为 False.
+
+    Returns:
+        int: 写出的行数
+    """
+    if compact:
+        encode = json.JSONEncoder(ensure_ascii=False,
+                                  separators=(",", ":")).encode
+        head, sep, tail, empty = '{"records":[', ",", "]}", '{"records":[]}'
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=4)
+        indent = "\n" + " " * 8
+        # 扁平的行用 C 编码器，把成员分隔符直接设为换行加三级缩进
+        flat = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=("," + indent + " " * 4, ": ")).encode
+
+        def encode(row: dict) -> str:
+            # 只有多余字段 (restkey 为 None) 的值是列表，需要逐层缩进；
+            # 字符串里的换行已被转义，这里替换的只有结构换行
+            if not row or None in row:
+                return encoder.encode(row).replace("\n", indent)
+            return "{" + indent + " " * 4 + flat(row)[1:-1] + indent + "}"
+
+        head, sep = '{\n    "records": [' + indent, "," + indent
+        tail, empty = "\n    ]\n}", '{\n    "records": []\n}'
+
+    count = 0
+    for row in rows:
+        json_obj.write((sep if count else head) + encode(row))
+        count += 1
+    json_obj.write(tail if count else empty)
+    return count
+
+
+def write_lines(rows: Iterable[dict], json_obj: TextIO) -> int:
+    """逐行写出 ndjson，每行一个紧凑的 json 对象
+
+    Args:
+        rows (Iterable[dict]): 行
+        json_obj (TextIO): 输出流
+
+    Returns:
+        int: 写出的行数
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    count = 0
+    for row in rows:
+        json_obj.write(encode(row) + "\n")
+        count += 1
+    return count
+
+
+def convert(in_file: str,
+            out_file: str,
+            compact: bool = False,
+            level: int = None,
+            threads: int = None,
+            columns: list = None,
+            where: str = None,
+            stats: dict = None) -> int:
+    """csv 转 json，逐行读取并写出，内存占用与文件大小无关
     注：默认文件存在不检查
 
+    Args:
+        in_file (str): csv 路径，.gz/.zst 自动解压
+        out_file (str): json 路径，.gz/.zst 自动压缩
+        compact (bool, optional): 输出紧凑的 json. 默认为 False.
+        level (int, optional): 输出的压缩级别，见 open_file. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+        columns (list, optional): 要保留的列，见 select_rows. 默认为 None.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+        stats (dict, optional): 见 select_rows. 默认为 None.
+
+    Returns:
+        int: 写出的行数
+    """
+    with open_file(in_file, newline='') as csv_obj, \
+            open_file(out_file, "w", level, threads) as json_obj:
+        rows = read_records(csv_obj, None, columns, where, stats)
+        return write_records(rows, json_obj, compact)
+
+
+def find_boundary(buffer, start: int, target: int) -> int:
+    """从 target 起找第一个不在引号内的换行，返回其后的位置
+
+    按 csv 模块默认方言的规则逐个字段匹配，见 CSV_FIELD，不会切断带换行的
+    字段，也不会把非引号字段里的引号当成引号字段的开始。
+
+    Args:
+        buffer: mmap 或 bytes，start 必须是记录开头
+        start (int): 起点
+        target (int): 期望的切点，不早于 start
+
+    Returns:
+        int: 边界位置，不超过 len(buffer)
+    """
+    size = len(buffer)
+    if target >= size:
+        return size
+
+    # 第一个引号之前的换行都是记录边界，到切点后的换行为止没有引号时直接切
+    newline = buffer.find(b"\n", target)
+    if newline == -1:
+        return size
+    quote = buffer.find(b'"', start, newline)
+    if quote == -1:
+        return newline + 1
+    pos = buffer.rfind(b"\n", start, quote) + 1 or start
+
+    # 先跳过 target 之前完整的字段，再匹配到所在记录的结尾
+    pos = CSV_FIELDS.match(buffer, pos, target).end()
+    match = CSV_RECORD_END.match(buffer, pos)
+    # 没有结尾说明引号没有闭合，其余内容都属于这个字段
+    return match.end() if match else size
+
+
+def split_chunks(buffer, start: int,
+                 chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """把 [start, len(buffer)) 切成约 chunk_size 字节、落在记录边界上的块
+
+    Args:
+        buffer: mmap 或 bytes
+        start (int): 第一条记录的起点
+        chunk_size (int): 每块的目标字节数
+
+    Yields:
+        Tuple[int, int]: (起点, 终点)
+    """
+    size = len(buffer)
+    while start < size:
+        end = find_boundary(buffer, start, start + chunk_size)
+        yield start, end
+        start = end
+
+
+def convert_chunk(in_file: str,
+                  start: int,
+                  end: int,
+                  fieldnames: list,
+                  columns: list = None,
+                  where: str = None) -> Tuple[str, int, int]:
+    """把 csv 的一块转为 ndjson 文本，供子进程调用
+
     Args:
         in_file (str): csv 路径
-        out_file (str): json 路径
+        start (int): 块起点，须是记录边界
+        end (int): 块终点，须是记录边界
+        fieldnames (list): 表头
+        columns (list, optional): 要保留的列，见 select_rows. 默认为 None.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+
+    Returns:
+        Tuple[str, int, int]: (ndjson 文本, 写出的行数, 读取的行数)
+    """
+    # 只读自己的一块，不再映射整个文件
+    with open(in_file, 'rb') as csv_obj:
+        csv_obj.seek(start)
+        text = csv_obj.read(end - start).decode('utf-8')
+
+    stats = {}
+    rows = read_records(io.StringIO(text, newline=''), fieldnames, columns,
+                        where, stats)
+    lines = io.StringIO()
+    count = write_lines(rows, lines)
+    return lines.getvalue(), count, stats.get("rows_read", count)
+
+
+def convert_ndjson(in_file: str,
+                   out_file: str,
+                   jobs: int = None,
+                   chunk_size: int = 4 << 20,
+                   level: int = None,
+                   threads: int = None,
+                   columns: list = None,
+                   where: str = None,
+                   stats: dict = None) -> int:
+    """csv 转 ndjson，每行一个紧凑的 json 对象
+
+    输入用 mmap 映射后在记录边界上切块，块交给进程池转换，结果按原顺序写出。
+    同时在途的块数有上限，内存不随文件大小增长。压缩的输入无法映射和切块，
+    在当前进程中逐行转换。
+
+    Args:
+        in_file (str): csv 路径，.gz/.zst 自动解压
+        out_file (str): ndjson 路径，.gz/.zst 自动压缩
+        jobs (int, optional): 进程数，为 1 时在当前进程转换. 默认为 CPU 核数.
+        chunk_size (int, optional): 每块的字节数. 默认为 4 MiB.
+        level (int, optional): 输出的压缩级别，见 open_file. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+        columns (list, optional): 要保留的列，见 select_rows. 默认为 None.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+        stats (dict, optional): 见 select_rows. 默认为 None.
+
+    Returns:
+        int: 写出的行数
     """
-    with open(in_file, newline='', encoding='utf-8') as csv_obj:
-        csv_reader = csv.DictReader(csv_obj)
-        rows = list(csv_reader)
+    if is_compressed(in_file):
+        with open_file(in_file, newline='') as csv_obj, \
+                open_file(out_file, "w", level, threads) as json_obj:
+            rows = read_records(csv_obj, None, columns, where, stats)
+            return write_lines(rows, json_obj)
+
+    if stats is None:
+        stats = {}
+    stats.setdefault("rows_read", 0)
+    count = 0
+    with open(in_file, 'rb') as csv_obj, \
+            open_file(out_file, "w", level, threads) as json_obj:
+        # 空文件无法映射
+        if os.fstat(csv_obj.fileno()).st_size == 0:
+            return 0
+
+        with mmap.mmap(csv_obj.fileno(), 0,
+                       access=mmap.ACCESS_READ) as buffer:
+            # 和 DictReader 一样，第一条记录就是表头
+            header_end = find_boundary(buffer, 0, 0)
+            header = buffer[:header_end].decode('utf-8')
+            fieldnames = next(csv.reader(io.StringIO(header, newline='')), [])
+            chunks = split_chunks(buffer, header_end, chunk_size)
+
+            if jobs == 1:
+                for start, end in chunks:
+                    text, rows, read = convert_chunk(in_file, start, end,
+                                                     fieldnames, columns,
+                                                     where)
+                    json_obj.write(text)
+                    count += rows
+                    stats["rows_read"] += read
+                return count
+
+            jobs = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                pending = deque()
+                for start, end in chunks:
+                    pending.append(
+                        executor.submit(convert_chunk, in_file, start, end,
+                                        fieldnames, columns, where))
+                    if len(pending) >= jobs * 2:
+                        text, rows, read = pending.popleft().result()
+                        json_obj.write(text)
+                        count += rows
+                        stats["rows_read"] += read
+                while pending:
+                    text, rows, read = pending.popleft().result()
+                    json_obj.write(text)
+                    count += rows
+                    stats["rows_read"] += read
+    return count
 
-    data = {"records": rows}
 
-    with open(out_file, 'w', encoding='utf-8') as json_obj:
-        json.dump(data, json_obj, indent=4, ensure_ascii=False)
+def merge_type(current: str, other: str) -> str:
+    """合并两块推断出的列类型
+
+    null 可并入任何类型，int 和 float 合并为 float，其余不同的类型合并为 str。
+
+    Args:
+        current (str): 已有的类型
+        other (str): 新一块的类型
+
+    Returns:
+        str: 能同时容纳两者的类型
+    """
+    if current == other or other == "null":
+        return current
+    if current == "null":
+        return other
+    if {current, other} == {"int", "float"}:
+        return "float"
+    return "str"
+
+
+def infer_type(values: np.ndarray) -> str:
+    """推断一块字符串值的类型，空字符串视为 null
+
+    Args:
+        values (np.ndarray): 一列中一块的值，str 数组
+
+    Returns:
+        str: "null"、"bool"、"int"、"float" 或 "str"
+    """
+    present = values[values != ""]
+    if not present.size:
+        return "null"
+    if np.isin(present, BOOL_VALUES).all():
+        return "bool"
+    # 数字要能原样写回：不带首尾空白和 "+"，numpy 的转换沿用 int()/float()，
+    # 还会接受 1_000 这样的写法
+    if ((np.char.strip(present) != present).any() or
+            np.char.startswith(present, "+").any() or
+            (np.char.count(present, "_") > 0).any()):
+        return "str"
+    # 整数部分不能有多余的前导零，"0"、"0.5" 可以，"007"、"00.5" 不行
+    unsigned = np.char.lstrip(present, "-")
+    rest = np.char.lstrip(unsigned, "0")
+    zeros = np.char.str_len(unsigned) - np.char.str_len(rest)
+    if ((zeros > 1) |
+        ((zeros == 1) & np.char.isdecimal(rest.astype("U1")))).any():
+        return "str"
+
+    # 最多一个负号，其余都是数字
+    if (np.char.isdecimal(unsigned) &
+        (np.char.str_len(present) - np.char.str_len(unsigned) <= 1)).all():
+        try:
+            numbers = present.astype(np.int64)
+        except OverflowError:
+            # 超出 int64 的整数转为 float 会丢失精度
+            return "str"
+        except ValueError:
+            pass
+        else:
+            # "-0" 和全角数字等写回后会变样
+            return "int" if (numbers.astype(str) == present).all() else "str"
+
+    try:
+        numbers = present.astype(np.float64)
+    except ValueError:
+        return "str"
+    # nan/inf 无法写成 json 数字
+    return "float" if np.isfinite(numbers).all() else "str"
+
+
+def to_typed(values: np.ndarray, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+    """按列类型转换一块值
+
+    Args:
+        values (np.ndarray): 一列中一块的值，str 数组
+        kind (str): 列类型，由 infer_type 和 merge_type 得到，不能是 str
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (值, null 掩码)，null 处的值为 0、False
+            或 nan
+    """
+    mask = values == ""
+    if kind == "bool":
+        return np.isin(values, TRUE_VALUES), mask
 
-    # 输出确认信息
-    print(f"CSV 文件已成功转换为 JSON 格式，并保存在 {out_file} 中。")
+    filled = np.where(mask, "0", values)
+    if kind == "int":
+        return filled.astype(np.int64), mask
+    data = filled.astype(np.float64)
+    data[mask] = np.nan
+    return data, mask
+
+
+def write_npy(npz: zipfile.ZipFile, name: str, dtype: np.dtype, count: int,
+              blocks: Iterable[np.ndarray]) -> None:
+    """把分块的一维数组写为 .npz 中的一个 .npy 成员，不在内存中拼接
+
+    Args:
+        npz (zipfile.ZipFile): 输出的 .npz
+        name (str): 数组名
+        dtype (np.dtype): 数组类型
+        count (int): 总长度，须等于各块长度之和
+        blocks (Iterable[np.ndarray]): 数据块
+    """
+    with npz.open(name + ".npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array_header_1_0(
+            member, {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (count, ),
+            })
+        for block in blocks:
+            member.write(block.astype(dtype, copy=False).tobytes())
+
+
+def write_text(npz: zipfile.ZipFile, name: str, count: int,
+               read: Callable[[], Iterable[list]]) -> None:
+    """把分块的字符串写为 UTF-8 字节数组 name 和偏移数组 name.offsets
+
+    第 i 个值为 name[offsets[i]:offsets[i + 1]]，不按最长的值定宽。
+
+    Args:
+        npz (zipfile.ZipFile): 输出的 .npz
+        name (str): 数组名
+        count (int): 字符串总数
+        read (Callable[[], Iterable[list]]): 每次调用从头返回各块字符串，
+            会调用两次
+    """
+    size = 0
+
+    def offsets() -> Iterator[np.ndarray]:
+        nonlocal size
+        yield np.zeros(1, dtype=np.int64)
+        for values in read():
+            ends = size + np.cumsum([len(value.encode()) for value in values],
+                                    dtype=np.int64)
+            if ends.size:
+                size = int(ends[-1])
+            yield ends
+
+    write_npy(npz, name + ".offsets", np.dtype(np.int64), count + 1, offsets())
+    write_npy(npz, name, np.dtype(np.uint8), size,
+              (np.frombuffer("".join(values).encode(), dtype=np.uint8)
+               for values in read()))
+
+
+def convert_columns(in_file: str,
+                    out_file: str,
+                    compact: bool = False,
+                    block_size: int = 8192,
+                    level: int = None,
+                    threads: int = None,
+                    columns: list = None,
+                    where: str = None,
+                    stats: dict = None) -> int:
+    """csv 转按列存放的 json {"columns": {列名: [...]}}，值带类型
+
+    第一遍按块读取，用 NumPy 推断每块每列的类型并合并，同时把每列的值
+    暂存到各自的临时文件；第二遍逐列读回、转换类型并写出，内存只与块大小有关。
+    只有尚在推断的列才建定宽数组，已确定为 str 的列和超过 MAX_NUMBER_LEN 的值
+    按变长文本暂存。空字符串视为 null（str 列除外），列数不足的行用空字符串补齐。
+
+    out_file 以 .npz 结尾时写为 NumPy 的 .npz，每列一个数组；有 null 的列另存
+    "列名.mask" 布尔数组，null 处的值为 0、False 或 nan。str 列写为 UTF-8
+    字节数组和 "列名.offsets"，见 write_text。
+
+    Args:
+        in_file (str): csv 路径，.gz/.zst 自动解压
+        out_file (str): json 或 .npz 路径，json 的 .gz/.zst 自动压缩
+        compact (bool, optional): 输出紧凑的 json. 默认为 False.
+        block_size (int, optional): 每块的行数. 默认为 8192.
+        level (int, optional): 输出的压缩级别，见 open_file；.npz 给出时
+            使用 deflate 压缩. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+        columns (list, optional): 要保留的列，见 select_rows. 默认为 None.
+        where (str, optional): 过滤条件，见 parse_where. 默认为 None.
+        stats (dict, optional): 见 select_rows. 默认为 None.
+
+    Returns:
+        int: 写出的行数
+    """
+    with contextlib.ExitStack() as stack:
+        csv_obj = stack.enter_context(open_file(in_file, newline=''))
+        reader = csv.reader(csv_obj)
+        header = next(reader, [])
+        names, rows = select_rows(reader, header, columns, where, "", stats)
+
+        spills = [stack.enter_context(tempfile.TemporaryFile()) for _ in names]
+        kinds = ["null"] * len(names)
+        has_null = [False] * len(names)
+        count = blocks = 0
+
+        for block in iter(lambda: list(islice(rows, block_size)), []):
+            fields = list(zip(*block))
+            for j in range(len(names)):
+                if kinds[j] != "str":
+                    if max(map(len, fields[j])) > MAX_NUMBER_LEN:
+                        kinds[j] = "str"
+                    else:
+                        values = np.array(fields[j], dtype=str)
+                        kinds[j] = merge_type(kinds[j], infer_type(values))
+                        has_null[j] = has_null[j] or bool((values == "").any())
+                pickle.dump(fields[j], spills[j], pickle.HIGHEST_PROTOCOL)
+            count += len(block)
+            blocks += 1
+
+        def read_spill(j: int) -> Iterator[tuple]:
+            spills[j].seek(0)
+            for _ in range(blocks):
+                yield pickle.load(spills[j])
+
+        def read_typed(j: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+            for values in read_spill(j):
+                yield to_typed(np.array(values, dtype=str), kinds[j])
+
+        if out_file.lower().endswith(".npz"):
+            compression = zipfile.ZIP_STORED
+            if level is not None:
+                compression = zipfile.ZIP_DEFLATED
+            with zipfile.ZipFile(out_file,
+                                 "w",
+                                 compression,
+                                 compresslevel=level) as npz:
+                for j, name in enumerate(names):
+                    if kinds[j] == "str":
+                        write_text(npz, name, count,
+                                   lambda j=j: read_spill(j))
+                        continue
+                    write_npy(npz, name, np.dtype(NPZ_DTYPES[kinds[j]]),
+                              count, (data for data, _ in read_typed(j)))
+                    if has_null[j]:
+                        write_npy(npz, name + ".mask", np.dtype(bool), count,
+                                  (mask for _, mask in read_typed(j)))
+            return count
+
+        # 每列的值写在同一行，只有列之间换行缩进
+        if compact:
+            item_sep, key_sep = ",", ":"
+            head, sep = '{"columns":{', ","
+            tail, empty = "}}", '{"columns":{}}'
+        else:
+            item_sep, key_sep = ", ", ": "
+            indent = "\n" + " " * 8
+            head, sep = '{\n    "columns": {' + indent, "," + indent
+            tail, empty = "\n    }\n}", '{\n    "columns": {}\n}'
+        encode = json.JSONEncoder(ensure_ascii=False,
+                                  separators=(item_sep, key_sep)).encode
+
+        json_obj = stack.enter_context(
+            open_file(out_file, "w", level, threads))
+        if not names:
+            json_obj.write(empty)
+            return count
+
+        json_obj.write(head)
+        for j, name in enumerate(names):
+            json_obj.write((sep if j else "") + encode(name) + key_sep + "[")
+            first = True
+            for values in read_spill(j):
+                items = values
+                if kinds[j] != "str":
+                    data, mask = to_typed(np.array(values, dtype=str),
+                                          kinds[j])
+                    items = data.tolist()
+                    for i in np.flatnonzero(mask).tolist():
+                        items[i] = None
+                text = encode(items)[1:-1]
+                if text:
+                    json_obj.write(text if first else item_sep + text)
+                    first = False
+            json_obj.write("]")
+        json_obj.write(tail)
+    return count
+
+
+def check_num(value: str) -> int:
+    """验证值在允许范围内,要求大于0。
+
+    Args:
+        value (str): 要验证的整数。
+
+    Raises:
+        argparse.ArgumentTypeError: 如果值超出了允许范围抛出。
+
+    Returns:
+        int: 范围内的有效整数。
+    """
+    value = int(value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            f"{value} is an invalid value,must be greater than 0")
+    return value
 
 
 def get_parameter() -> argparse.Namespace:
@@ -80,13 +879,31 @@ def get_parameter() -> argparse.Namespace:
             parser.error(
                 "No file or does not exist,-if must be the csv file path")
 
+        names = list(args.columns or [])
+        if args.where:
+            try:
+                names.append(parse_where(args.where)[0])
+            except ValueError as err:
+                parser.error(str(err))
+
+        # 列名写错时在这里报错，不在转换途中抛出 KeyError
+        if names:
+            with open_file(args.in_file, newline='') as csv_obj:
+                header = next(csv.reader(csv_obj), [])
+            missing = [name for name in dict.fromkeys(names)
+                       if name not in header]
+            if missing:
+                parser.error("column not in the header: " +
+                             ", ".join(map(repr, missing)))
+
+        if args.layout == "columns" and args.format == "ndjson":
+            parser.error("--layout columns cannot be used with ndjson")
+
         if not args.out_file:
             args.out_file = args.in_file + ".json"
-        else:
-            if not os.path.exists(args.out_file) or os.path.isfile(
-                    args.out_file):
-                parser.error(
-                    "No file or does not exist,-of must be the json file path")
+        elif os.path.isdir(args.out_file):
+            # 输出文件可以不存在，只要不是目录
+            parser.error("-of must be the json file path, not a directory")
 
     parser = argparse.ArgumentParser(prog=f"{__Name__}",
                                      description=f"{__Description__}",
@@ -97,6 +914,42 @@ def get_parameter() -> argparse.Namespace:
                         help="increase output version")
     parser.add_argument("-if", "--in_file", help="input csv file path")
     parser.add_argument("-of", "--out_file", help="out json file path")
+    parser.add_argument("-c",
+                        "--compact",
+                        action="store_true",
+                        help="write compact json without indentation")
+    parser.add_argument("-f",
+                        "--format",
+                        choices=["json", "ndjson"],
+                        default="json",
+                        help="ndjson writes one compact object per line and "
+                        "converts chunks in parallel (default: json)")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=check_num,
+                        help="worker processes for ndjson "
+                        "(default: CPU count)")
+    parser.add_argument("--columns",
+                        nargs="+",
+                        metavar="COLUMN",
+                        help="keep only these columns, in this order")
+    parser.add_argument("--where",
+                        help="keep rows matching 'column operator value', "
+                        "operator is one of == != < <= > >=, e.g. "
+                        "\"age >= 18\"; numbers compare numerically")
+    parser.add_argument("--layout",
+                        choices=["records", "columns"],
+                        default="records",
+                        help="columns writes {\"columns\": {name: [...]}} "
+                        "with inferred int/float/bool/null types, or a .npz "
+                        "when -of ends with .npz (default: records)")
+    parser.add_argument("--level",
+                        type=int,
+                        help="compression level for .gz (0-9) or .zst "
+                        "(up to 22) output")
+    parser.add_argument("--threads",
+                        type=check_num,
+                        help="zstd compression threads for .zst output")
 
     args = parser.parse_args()
     check_restraint(parser, args)
@@ -109,4 +962,41 @@ if __name__ == '__main__':
     if args.version:
         get_version()
     else:
-        convert(args.in_file, args.out_file)
+        stats = {}
+        start = time.perf_counter()
+        if args.layout == "columns":
+            written = convert_columns(args.in_file,
+                                      args.out_file,
+                                      args.compact,
+                                      level=args.level,
+                                      threads=args.threads,
+                                      columns=args.columns,
+                                      where=args.where,
+                                      stats=stats)
+        elif args.format == "ndjson":
+            written = convert_ndjson(args.in_file,
+                                     args.out_file,
+                                     args.jobs,
+                                     level=args.level,
+                                     threads=args.threads,
+                                     columns=args.columns,
+                                     where=args.where,
+                                     stats=stats)
+        else:
+            written = convert(args.in_file,
+                              args.out_file,
+                              args.compact,
+                              args.level,
+                              args.threads,
+                              columns=args.columns,
+                              where=args.where,
+                              stats=stats)
+        seconds = max(time.perf_counter() - start, 1e-9)
+        # 没有过滤时读取的行数就是写出的行数
+        read = stats.get("rows_read", written)
+        size = os.path.getsize(args.in_file) / 2**20
+
+        # 输出确认信息
+        print(f"CSV 文件已成功转换为 JSON 格式，并保存在 {args.out_file} 中。")
+        print(f"读取 {read:,} 行，写出 {written:,} 行，耗时 {seconds:.2f} 秒，"
+              f"{read / seconds:,.0f} 行/秒，{size / seconds:.1f} MiB/s。")
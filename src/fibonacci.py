@@ -10,6 +10,18 @@
 ---Version 0.2.0---
 @Time           : 2024/01/22
 @Description    : 添加命令行支持
+---Version 0.3.0---
+@Time           : 2026/10/18
+@Description    : 添加快速倍增法 fib(n) 及 --nth
+---Version 0.4.0---
+@Time           : 2026/10/18
+@Description    : 生成器流式输出，添加 --start/--count/--out_file
+---Version 0.5.0---
+@Time           : 2026/10/18
+@Description    : 添加批量取模 fib_mod，基于皮萨诺周期和向量化矩阵幂
+---Version 0.6.0---
+@Time           : 2026/10/18
+@Description    : 添加 --format dec/hex/summary，大整数分治转十进制
 '''
 
 __Author__ = "ZouZhao"
@@ -18,8 +30,20 @@ __License__ = "Copyright (c) 2023 by zouzhao, All Rights Reserved."
 __Name__ = "Fibonacci"
 __Description__ = "Generates Fibonacci of the specified length"
 
+import sys
+import decimal
 import argparse
-from typing import List
+import functools
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+import numpy as np
+
+# 超过该模数时不再计算皮萨诺周期，O(m) 的求周期开销得不偿失
+PISANO_LIMIT = 10**6
+# 模数不超过 2^31 时两项乘积之和不会溢出 int64
+INT64_SAFE_MODULUS = 2**31
+# 不超过该位数（约 4200 位十进制）的整数直接用 str()，低于解释器 4300 位的限制
+DECIMAL_THRESHOLD_BITS = 14000
 
 
 def get_version() -> str:
@@ -54,6 +78,261 @@ def generate_fibonacci_numbers(num: int) -> List[int]:
     return (', '.join(series))
 
 
+def fib_pair(n: int) -> Tuple[int, int]:
+    """快速倍增法求 (F(n), F(n+1))，只需 O(log n) 次大整数乘法
+
+    F(2k) = F(k) * (2F(k+1) - F(k))
+    F(2k+1) = F(k)^2 + F(k+1)^2
+
+    Args:
+        n (int): 下标，F(0) = 0，F(1) = F(2) = 1
+
+    Returns:
+        Tuple[int, int]: (F(n), F(n+1))
+    """
+    if n < 0:
+        raise ValueError(f"{n} is an invalid value,must not be negative")
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib(n: int) -> int:
+    """求第 n 个斐波那契数，不生成整个数列
+
+    Args:
+        n (int): 下标，F(0) = 0，F(1) = F(2) = 1
+
+    Returns:
+        int: F(n)
+    """
+    return fib_pair(n)[0]
+
+
+def iter_fibonacci(start: int = 1, count: int = None) -> Iterator[int]:
+    """逐项生成斐波那契数列，只保留最后两项
+
+    Args:
+        start (int, optional): 第一项的下标，前缀用快速倍增法直接跳过. 默认为 1.
+        count (int, optional): 生成的项数，None 表示无限生成. 默认为 None.
+
+    Yields:
+        int: F(start), F(start+1), ...
+    """
+    a, b = fib_pair(start)
+    while count is None or count > 0:
+        yield a
+        a, b = b, a + b
+        if count is not None:
+            count -= 1
+
+
+def int_to_decimal(value: int) -> str:
+    """大整数转十进制字符串，不受 sys.set_int_max_str_digits 限制
+
+    按二进制位对半拆分，借助 decimal 模块（libmpdec 的乘法是次二次的）
+    合并：D(n) = D(hi) * D(2^k) + D(lo)，整体复杂度低于 str() 的 O(n^2)。
+
+    Args:
+        value (int): 整数
+
+    Returns:
+        str: 十进制表示
+    """
+    if value < 0:
+        return "-" + int_to_decimal(-value)
+    if value.bit_length() <= DECIMAL_THRESHOLD_BITS:
+        return str(value)
+
+    with decimal.localcontext() as ctx:
+        ctx.prec = decimal.MAX_PREC
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.traps[decimal.Inexact] = True
+        powers = {}
+
+        def power_of_two(bits: int) -> decimal.Decimal:
+            if bits not in powers:
+                powers[bits] = decimal.Decimal(2)**bits
+            return powers[bits]
+
+        def inner(n: int, bits: int) -> decimal.Decimal:
+            if bits <= DECIMAL_THRESHOLD_BITS:
+                return decimal.Decimal(n)
+            half = bits >> 1
+            hi = n >> half
+            lo = n - (hi << half)
+            return inner(hi, bits - half) * power_of_two(half) + inner(
+                lo, half)
+
+        return str(inner(value, value.bit_length()))
+
+
+def summarize_int(value: int, lead: int = 20) -> Tuple[int, str]:
+    """求整数的十进制位数和前 lead 位，不做完整的进制转换
+
+    只取最高的若干二进制位，用高精度 log10 推算位数和首位数字。
+
+    Args:
+        value (int): 非负整数
+        lead (int, optional): 前导位数. 默认为 20.
+
+    Returns:
+        Tuple[int, str]: (十进制位数, 前 lead 位)
+    """
+    if value.bit_length() <= DECIMAL_THRESHOLD_BITS:
+        text = str(value)
+        return len(text), text[:lead]
+
+    # 每位十进制约 3.32 个二进制位，多留 40 位余量；截断只会让估算偏小
+    shift = value.bit_length() - (lead + 40) * 4
+    top = value >> shift
+    with decimal.localcontext() as ctx:
+        ctx.prec = lead + 60 + len(str(shift))
+        log = decimal.Decimal(top).log10() + \
+            decimal.Decimal(shift) * decimal.Decimal(2).log10()
+        digits = int(log) + 1
+        mantissa = decimal.Decimal(10)**(log - (digits - 1))
+        leading = str(int(mantissa * 10**(lead + 29)))
+
+    # 估算值紧贴进位边界（后续全为 9）时可能差一，改用精确计算
+    if leading[lead:lead + 25] == "9" * 25:
+        if value >= 10**digits:
+            digits += 1
+        leading = str(value // 10**max(digits - lead, 0))
+    return digits, leading[:min(lead, digits)]
+
+
+def format_term(value: int, fmt: str = "dec") -> str:
+    """按输出格式转换一项
+
+    Args:
+        value (int): 整数
+        fmt (str, optional): dec 十进制，hex 十六进制，
+            summary 只输出位数和前 20 位. 默认为 "dec".
+
+    Returns:
+        str: 转换结果
+    """
+    if fmt == "hex":
+        return hex(value)
+    if fmt == "summary":
+        digits, leading = summarize_int(value)
+        if digits <= len(leading):
+            return leading
+        return f"{leading}...({digits} digits)"
+    return int_to_decimal(value)
+
+
+def write_fibonacci(count: int,
+                    start: int = 1,
+                    out: TextIO = None,
+                    buffer_size: int = 1 << 16,
+                    fmt: str = "dec") -> None:
+    """把数列以 ", " 分隔流式写出，格式与 generate_fibonacci_numbers 一致
+
+    Args:
+        count (int): 项数
+        start (int, optional): 第一项的下标. 默认为 1.
+        out (TextIO, optional): 输出流. 默认为 sys.stdout.
+        buffer_size (int, optional): 攒够多少字符写一次. 默认为 1 << 16.
+        fmt (str, optional): 每项的输出格式，见 format_term. 默认为 "dec".
+    """
+    if out is None:
+        out = sys.stdout
+
+    buffer, buffered = [], 0
+    for i, term in enumerate(iter_fibonacci(start, count)):
+        text = format_term(term, fmt)
+        if i:
+            text = ", " + text
+        buffer.append(text)
+        buffered += len(text)
+        if buffered >= buffer_size:
+            out.write("".join(buffer))
+            buffer, buffered = [], 0
+    buffer.append("\n")
+    out.write("".join(buffer))
+    out.flush()
+
+
+@functools.lru_cache(maxsize=None)
+def pisano_period(modulus: int) -> int:
+    """求皮萨诺周期 π(m)，即 F(n) mod m 的周期，结果按模数缓存
+
+    Args:
+        modulus (int): 模数，要求大于 0
+
+    Returns:
+        int: 周期，不超过 6m
+    """
+    if modulus == 1:
+        return 1
+
+    a, b = 0, 1
+    for i in range(1, 6 * modulus + 1):
+        a, b = b, (a + b) % modulus
+        if a == 0 and b == 1:
+            return i
+    raise ArithmeticError(f"no pisano period found for {modulus}")
+
+
+def fib_mod(indices: Iterable[int], modulus: int) -> np.ndarray:
+    """批量求 F(i) mod m
+
+    下标先按皮萨诺周期取模，再对整批下标逐位做向量化的矩阵快速幂。
+    对称的斐波那契矩阵 [[F(k+1), F(k)], [F(k), F(k-1)]] 只需保存
+    (F(k), F(k+1)) 两项。
+
+    Args:
+        indices (Iterable[int]): 非负下标，可以是任意大的整数
+        modulus (int): 模数，要求大于 0
+
+    Returns:
+        np.ndarray: 与 indices 形状相同的结果，模数超过 2^31 时为 object 数组
+    """
+    if modulus <= 0:
+        raise ValueError(f"{modulus} is an invalid modulus,must be greater than 0")
+
+    idx = np.asarray(indices)
+    if idx.size == 0:
+        idx = idx.astype(np.int64)
+    if idx.dtype.kind not in "iuO":
+        raise TypeError(f"indices must be integers, got {idx.dtype}")
+    if idx.size and (idx < 0).any():
+        raise ValueError("indices must not be negative")
+
+    if modulus <= PISANO_LIMIT:
+        idx = idx % pisano_period(modulus)
+    try:
+        idx = idx.astype(np.int64)
+    except OverflowError:
+        # 没有按周期取模的超大下标保留为 object 数组逐位处理
+        pass
+
+    dtype = np.int64 if modulus <= INT64_SAFE_MODULUS else object
+    a = np.zeros(idx.shape, dtype=dtype)
+    b = np.ones(idx.shape, dtype=dtype) % modulus
+
+    # f, g = F(2^j), F(2^j + 1)
+    f, g = 1, 1 % modulus
+    bits = int(idx.max()).bit_length() if idx.size else 0
+    for j in range(bits):
+        mask = (idx >> j) & 1 == 1
+        # F(n+k) = F(n)F(k-1) + F(n+1)F(k), F(n+k+1) = F(n)F(k) + F(n+1)F(k+1)
+        h = (g - f) % modulus
+        a, b = (np.where(mask, (a * h + b * f) % modulus, a),
+                np.where(mask, (a * f + b * g) % modulus, b))
+        f, g = f * ((2 * g - f) % modulus) % modulus, (f * f + g * g) % modulus
+    return a
+
+
 def check_num(value: int) -> int:
     """验证值在允许范围内,要求大于0。
 
@@ -93,8 +372,29 @@ def get_parameter() -> argparse.Namespace:
                         "--num",
                         type=check_num,
                         help="input fibonacci num")
+    parser.add_argument("--nth",
+                        type=check_num,
+                        help="print only the nth fibonacci number")
+    parser.add_argument("--start",
+                        type=check_num,
+                        default=1,
+                        help="index of the first term to print (default: 1)")
+    parser.add_argument("--count",
+                        type=check_num,
+                        help="number of terms to print, same as -n")
+    parser.add_argument("-of",
+                        "--out_file",
+                        help="write the terms to this file instead of stdout")
+    parser.add_argument("-f",
+                        "--format",
+                        choices=["dec", "hex", "summary"],
+                        default="dec",
+                        help="term format: decimal, hex, or digit count with "
+                        "leading digits (default: dec)")
 
     args = parser.parse_args()
+    if not args.version and not args.nth and not (args.num or args.count):
+        parser.error("one of -n/--num, --count or --nth is required")
 
     return args
 
@@ -103,5 +403,13 @@ if __name__ == '__main__':
     args = get_parameter()
     if args.version:
         get_version()
+    elif args.nth:
+        print(format_term(fib(args.nth), args.format))
+    elif args.out_file:
+        with open(args.out_file, "w", encoding="utf-8") as file_obj:
+            write_fibonacci(args.count or args.num,
+                            args.start,
+                            file_obj,
+                            fmt=args.format)
     else:
-        print(generate_fibonacci_numbers(args.num))
+        write_fibonacci(args.count or args.num, args.start, fmt=args.format)
@@ -10,6 +10,27 @@
 ---Version 0.2.0---
 @Time           : 2024/01/22
 @Description    : 添加命令行支持
+---Version 0.3.0---
+@Time           : 2026/10/18
+@Description    : 添加 --stream，逐个解析顶层数组元素或对象成员并写出
+---Version 0.4.0---
+@Time           : 2026/10/18
+@Description    : 优先使用 libyaml 的 CDumper，不可用时回退
+---Version 0.5.0---
+@Time           : 2026/10/18
+@Description    : 添加 -id/-od 目录模式，进程池批量转换
+---Version 0.6.0---
+@Time           : 2026/10/18
+@Description    : 添加 --input-format jsonl，输出多文档 YAML 流
+---Version 0.7.0---
+@Time           : 2026/10/18
+@Description    : 添加 --dedupe，重复的子树用 YAML 锚点和别名输出
+---Version 0.8.0---
+@Time           : 2026/10/18
+@Description    : 添加 --pointer，按 JSON Pointer 只转换选中的子树
+---Version 0.9.0---
+@Time           : 2026/10/18
+@Description    : 按扩展名直接读写 .gz/.zst 压缩文件，添加 --level/--threads
 '''
 
 __Author__ = "ZouZhao"
@@ -19,10 +40,31 @@ __Name__ = "jsonToYaml"
 __Description__ = "json to yaml"
 
 import os
+import re
+import sys
+import gzip
 import json
+import time
+import hashlib
 import argparse
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TextIO
 
 import yaml
+import pyzstd
+
+# libyaml 可用时使用 C 实现，否则回退到纯 Python 实现
+try:
+    from yaml import CDumper as Dumper
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import Dumper
+    YAML_BACKEND = "pure-python"
+
+# 按扩展名识别的压缩格式
+COMPRESSED_SUFFIXES = (".gz", ".zst")
 
 
 def get_version() -> str:
@@ -32,24 +74,603 @@ def get_version() -> str:
         str: 版本版本信息
     """
     print(f"{__Author__} {__Name__} {__Version__} \n{__License__}")
+    print(f"YAML backend: {YAML_BACKEND}")
+
+
+def open_file(path: str,
+              mode: str = "r",
+              level: int = None,
+              threads: int = None) -> TextIO:
+    """以 utf-8 文本方式打开文件，.gz/.zst 按扩展名透明压缩和解压
+
+    Args:
+        path (str): 文件路径
+        mode (str, optional): "r" 或 "w". 默认为 "r".
+        level (int, optional): 写出时的压缩级别，gzip 为 0-9，zstd 最高 22.
+            默认为各格式的默认级别.
+        threads (int, optional): zstd 写出时的压缩线程数，gzip 不支持.
+            默认为单线程.
+
+    Returns:
+        TextIO: 文本流
+    """
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        kwargs = {}
+        if mode == "w" and level is not None:
+            kwargs["compresslevel"] = level
+        return gzip.open(path, mode + "t", encoding="utf-8", **kwargs)
+    if lower.endswith(".zst"):
+        option = {}
+        if mode == "w":
+            if level is not None:
+                option[pyzstd.CParameter.compressionLevel] = level
+            if threads:
+                option[pyzstd.CParameter.nbWorkers] = threads
+        return pyzstd.open(path, mode + "t", level_or_option=option or None,
+                           encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonReader:
+    """在分块读入的文本流上增量解析 JSON，缓冲只保留尚未消费的部分
+    """
+
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    NUMBER_TAIL = re.compile(r"[0-9+\-.eE]*")
+    STRING_SPECIAL = re.compile(r'["\\]')
+    # 一次匹配到下一个括号为止的所有非括号字符和完整字符串
+    SKIP_RUN = re.compile(
+        r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.S)
+    SCALAR = re.compile(r"[^ \t\n\r,\]}]*")
+
+    def __init__(self, file, chunk_size: int = 1 << 16):
+        """
+        Args:
+            file: 文本流
+            chunk_size (int, optional): 每次读入的字符数. 默认为 1 << 16.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size: int = None) -> bool:
+        """读入更多数据，同时丢弃已消费的部分
+
+        Args:
+            size (int, optional): 读入的字符数. 默认为 chunk_size.
+
+        Returns:
+            bool: 是否读到了数据
+        """
+        if self.eof:
+            return False
+        data = self.file.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白，返回下一个字符
+
+        Returns:
+            str: 下一个字符，到达末尾返回空串
+        """
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """跳过空白并消费指定字符
+
+        Args:
+            char (str): 期望的字符
+
+        Raises:
+            ValueError: 下一个字符不符时抛出
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def decode(self):
+        """解析下一个完整的 JSON 值
+
+        Returns:
+            解析得到的 Python 对象
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill(size):
+                    raise
+                # 大元素按倍数读入，避免反复从头重试造成平方开销
+                size *= 2
+                continue
+            # 数字可能在缓冲末尾被截断（如 "-2." 只解析出 -2），读入更多后再解析一次
+            if isinstance(value, (int, float)) and self.NUMBER_TAIL.match(
+                    self.buffer, end).end() == len(self.buffer) and self.fill(
+                        size):
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+    def skip_string(self) -> None:
+        """跳过字符串的剩余部分，调用时 pos 指向开头引号之后
+
+        Raises:
+            ValueError: 字符串未结束时抛出
+        """
+        while True:
+            m = self.STRING_SPECIAL.search(self.buffer, self.pos)
+            if m is None:
+                self.pos = len(self.buffer)
+            elif m.group() == '"':
+                self.pos = m.end()
+                return
+            elif m.end() < len(self.buffer):
+                # 跳过转义字符
+                self.pos = m.end() + 1
+                continue
+            else:
+                # 反斜杠恰好在缓冲末尾，保留它等待下一块
+                self.pos = m.start()
+            if not self.fill():
+                raise ValueError("unterminated string")
+
+    def skip(self) -> None:
+        """跳过下一个 JSON 值，只扫描字符，不构造 Python 对象，
+        扫描过的部分随读入新数据丢弃
+
+        Raises:
+            ValueError: 值不完整时抛出
+        """
+        first = self.peek()
+        if first == '"':
+            self.pos += 1
+            self.skip_string()
+            return
+
+        if first not in ("[", "{"):
+            while True:
+                end = self.SCALAR.match(self.buffer, self.pos).end()
+                if end < len(self.buffer):
+                    self.pos = end
+                    return
+                self.pos = end
+                if not self.fill():
+                    return
+
+        depth = 0
+        while True:
+            self.pos = self.SKIP_RUN.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer):
+                if not self.fill():
+                    raise ValueError("unexpected end of JSON input")
+                continue
+            char = self.buffer[self.pos]
+            self.pos += 1
+            if char == '"':
+                # 字符串被分块截断，逐段跳过
+                self.skip_string()
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def seek(self, pointer: str) -> None:
+        """按 JSON Pointer（RFC 6901）定位到子树开头，不匹配的兄弟节点直接跳过
+
+        Args:
+            pointer (str): 如 /spec/templates/0，空串表示整个文档
+
+        Raises:
+            KeyError: 路径不存在时抛出
+        """
+        if pointer and not pointer.startswith("/"):
+            raise KeyError(f"invalid JSON pointer {pointer!r}")
+        tokens = pointer.split("/")[1:] if pointer else []
+
+        for token in tokens:
+            token = token.replace("~1", "/").replace("~0", "~")
+            first = self.peek()
+            found = False
+            if first == "{":
+                self.pos += 1
+                while self.peek() not in ("}", ""):
+                    key = self.decode()
+                    self.expect(":")
+                    if key == token:
+                        found = True
+                        break
+                    self.skip()
+                    if self.peek() != ",":
+                        break
+                    self.pos += 1
+            elif first == "[" and token.isdigit() and (token == "0"
+                                                       or token[0] != "0"):
+                self.pos += 1
+                found = self.peek() not in ("]", "")
+                for _ in range(int(token)):
+                    self.skip()
+                    if self.peek() != ",":
+                        found = False
+                        break
+                    self.pos += 1
+            if not found:
+                raise KeyError(f"JSON pointer {pointer!r} not found")
+
+
+def stream_convert(json_file, yaml_file, pointer: str = "") -> None:
+    """逐个解析顶层数组元素或对象成员并立即写出，内存只与最大的单个元素有关
+    结果与一次性 yaml.dump 整个文档相同（重复键会全部保留）
+
+    Args:
+        json_file: json 文本流
+        yaml_file: yaml 文本流
+        pointer (str, optional): JSON Pointer，只转换选中的子树. 默认为 "".
+    """
+    reader = JsonReader(json_file)
+    reader.seek(pointer)
+    first = reader.peek()
+    if first not in ("[", "{"):
+        yaml_file.write(
+            yaml.dump(reader.decode(), Dumper=Dumper, sort_keys=False))
+        return
+
+    last = "]" if first == "[" else "}"
+    reader.pos += 1
+    if reader.peek() == last:
+        yaml_file.write(first + last + "\n")
+        return
+
+    while True:
+        if first == "[":
+            item = [reader.decode()]
+        else:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise ValueError(f"object key must be a string, got {key!r}")
+            reader.expect(":")
+            item = {key: reader.decode()}
+        yaml_file.write(yaml.dump(item, Dumper=Dumper, sort_keys=False))
+
+        if reader.peek() != ",":
+            break
+        reader.pos += 1
+    reader.expect(last)
+
+
+def dedupe(data, min_size: int = 64) -> tuple:
+    """结构去重，把内容相同的重复子树替换为同一个对象，
+    yaml.dump 遇到同一对象会输出锚点 &id 和别名 *id
+
+    先自底向上计算每个对象、数组的哈希和近似大小（JSON 字符数），
+    再按文档顺序替换，首次出现的子树作为锚点，被替换的子树不再展开。
+
+    Args:
+        data: json.load 得到的对象
+        min_size (int, optional): 参与去重的最小子树大小. 默认为 64.
+
+    Returns:
+        tuple: (去重后的对象, 估算节省的字节数)
+    """
+    # 顶层是数字、布尔值或 null 时没有可去重的子树
+    if not isinstance(data, (dict, list)):
+        return data, 0
+
+    info = {}
+
+    def measure(node) -> tuple:
+        """返回 (哈希, 大小)，对象和数组的结果记录在 info 中"""
+        if isinstance(node, dict):
+            digest = hashlib.blake2b(b"{", digest_size=16)
+            size = 2
+            for key, value in node.items():
+                child, child_size = measure(value)
+                digest.update(
+                    repr(key).encode("utf-8", "surrogatepass") + b":" + child)
+                size += len(key) + 4 + child_size
+        elif isinstance(node, list):
+            digest = hashlib.blake2b(b"[", digest_size=16)
+            size = 2
+            for value in node:
+                child, child_size = measure(value)
+                digest.update(child)
+                size += child_size + 1
+        else:
+            text = f"{type(node).__name__}:{node!r}"
+            return text.encode("utf-8", "surrogatepass"), len(text)
+        info[id(node)] = (digest.digest(), size)
+        return info[id(node)]
+
+    measure(data)
 
+    first = {}
+    dumped = {}
+    saved = 0
+    # column 为子树内容在输出中的缩进列，块格式下映射中的序列不额外缩进
+    stack = [(data, 0)]
+    while stack:
+        node, column = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        children = []
+        for key, value in items:
+            if id(value) not in info:
+                continue
+            digest, size = info[id(value)]
+            child_column = column if isinstance(node, dict) and isinstance(
+                value, list) else column + 2
+            if size < min_size:
+                children.append((value, child_column))
+            elif digest in first:
+                node[key] = first[digest]
+                if digest not in dumped:
+                    text = yaml.dump(value, Dumper=Dumper, sort_keys=False)
+                    dumped[digest] = (len(text), text.count("\n"))
+                # 别名形如 *id001，锚点 &id001 只在首次出现处写一次
+                length, lines = dumped[digest]
+                saved += length + lines * child_column - 6
+            else:
+                first[digest] = value
+                children.append((value, child_column))
+        # 逆序入栈，保证按文档顺序遇到首次出现的子树
+        stack.extend(reversed(children))
+    saved -= 7 * len(dumped)
+    return data, saved
 
-def convert(in_file: str, out_file: str) -> None:
+
+def convert(in_file: str,
+            out_file: str,
+            stream: bool = False,
+            dedupe_size: int = None,
+            pointer: str = None,
+            level: int = None,
+            threads: int = None) -> int:
     """json 转 yaml
     注：默认文件存在不检查
 
+    Args:
+        in_file (str): json 路径，.gz/.zst 自动解压
+        out_file (str): yaml 路径，.gz/.zst 自动压缩
+        stream (bool, optional): 是否流式转换顶层数组或对象. 默认为 False.
+        dedupe_size (int, optional): 不为 None 时对不小于该大小的重复子树去重，
+            不能与 stream 同时使用. 默认为 None.
+        pointer (str, optional): JSON Pointer，如 /spec/templates，
+            只解析和转换选中的子树. 默认为 None.
+        level (int, optional): 输出的压缩级别，见 open_file. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+
+    Returns:
+        int: 去重估算节省的字节数，未去重时为 0
+    """
+    if stream:
+        with open_file(in_file) as json_file, \
+                open_file(out_file, "w", level, threads) as yaml_file:
+            stream_convert(json_file, yaml_file, pointer or "")
+        return 0
+
+    with open_file(in_file) as json_file:
+        if pointer:
+            reader = JsonReader(json_file)
+            reader.seek(pointer)
+            data = reader.decode()
+        else:
+            data = json.load(json_file)
+
+    saved = 0
+    if dedupe_size is not None:
+        data, saved = dedupe(data, dedupe_size)
+
+    yaml_data = yaml.dump(data, Dumper=Dumper, sort_keys=False)
+
+    with open_file(out_file, "w", level, threads) as yaml_file:
+        yaml_file.write(yaml_data)
+    return saved
+
+
+def dump_lines(lines: list, first_line: int = 1) -> str:
+    """把一批 JSON Lines 转为以 --- 分隔的 YAML 文档，供子进程调用
+
+    Args:
+        lines (list): 每行一个 JSON 文档，空行跳过
+        first_line (int, optional): 第一行的行号，用于报错. 默认为 1.
+
+    Raises:
+        ValueError: 某行不是合法 JSON 时抛出
+
+    Returns:
+        str: YAML 文本
+    """
+    docs = []
+    for number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            docs.append(json.loads(line))
+        except json.JSONDecodeError as err:
+            raise ValueError(f"line {number}: {err}") from None
+    if not docs:
+        return ""
+    return yaml.dump_all(docs,
+                         Dumper=Dumper,
+                         sort_keys=False,
+                         explicit_start=True)
+
+
+def convert_jsonl(in_file: str,
+                  out_file: str,
+                  jobs: int = None,
+                  batch_size: int = 1000,
+                  level: int = None,
+                  threads: int = None) -> None:
+    """JSON Lines 转多文档 YAML 流，按批交给进程池解析和输出，结果按原顺序写出
+    同时在途的批次数有上限，内存不随文件大小增长
+
+    Args:
+        in_file (str): jsonl 路径，.gz/.zst 自动解压
+        out_file (str): yaml 路径，.gz/.zst 自动压缩
+        jobs (int, optional): 进程数，为 1 时在当前进程转换. 默认为 CPU 核数.
+        batch_size (int, optional): 每批的行数. 默认为 1000.
+        level (int, optional): 输出的压缩级别，见 open_file. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+    """
+    with open_file(in_file) as json_file, \
+            open_file(out_file, "w", level, threads) as yaml_file:
+        batches = iter(lambda: list(islice(json_file, batch_size)), [])
+
+        if jobs == 1:
+            for i, lines in enumerate(batches):
+                yaml_file.write(dump_lines(lines, i * batch_size + 1))
+            return
+
+        jobs = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            pending = deque()
+            for i, lines in enumerate(batches):
+                pending.append(
+                    executor.submit(dump_lines, lines, i * batch_size + 1))
+                if len(pending) >= jobs * 2:
+                    yaml_file.write(pending.popleft().result())
+            while pending:
+                yaml_file.write(pending.popleft().result())
+
+
+def convert_file(in_file: str,
+                 out_file: str,
+                 stream: bool = False,
+                 dedupe_size: int = None,
+                 pointer: str = None,
+                 level: int = None,
+                 threads: int = None) -> tuple:
+    """在子进程中转换单个文件，异常作为结果返回，不影响其余文件
+
     Args:
         in_file (str): json 路径
         out_file (str): yaml 路径
+        stream (bool, optional): 是否流式转换. 默认为 False.
+        dedupe_size (int, optional): 去重的最小子树大小，见 convert. 默认为 None.
+        pointer (str, optional): JSON Pointer，见 convert. 默认为 None.
+        level (int, optional): 输出的压缩级别，见 open_file. 默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+
+    Returns:
+        tuple: (json 路径, 字节数, 耗时秒数, 错误信息，成功时为 None)
     """
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(out_file) or ".", exist_ok=True)
+        convert(in_file, out_file, stream, dedupe_size, pointer, level,
+                threads)
+        size = os.path.getsize(in_file)
+    except Exception as err:
+        error = f"{type(err).__name__}: {err}"
+        return in_file, 0, time.perf_counter() - start, error
+    return in_file, size, time.perf_counter() - start, None
 
-    with open(in_file, 'r', encoding="utf-8") as json_file:
-        data = json.load(json_file)
 
-    yaml_data = yaml.dump(data, sort_keys=False)
+def convert_dir(in_dir: str,
+                out_dir: str = None,
+                jobs: int = None,
+                stream: bool = False,
+                dedupe_size: int = None,
+                pointer: str = None,
+                level: int = None,
+                threads: int = None) -> dict:
+    """用进程池把目录下（含子目录）所有 .json 文件转为 .yaml，
+    .json.gz/.json.zst 转为同样压缩的 .yaml.gz/.yaml.zst，
+    每完成一个文件打印一行结果，最后打印汇总
 
-    with open(out_file, 'w', encoding="utf-8") as yaml_file:
-        yaml_file.write(yaml_data)
+    Args:
+        in_dir (str): json 目录
+        out_dir (str, optional): yaml 目录，保持相同的子目录结构. 默认为 in_dir.
+        jobs (int, optional): 进程数. 默认为 CPU 核数.
+        stream (bool, optional): 是否流式转换. 默认为 False.
+        dedupe_size (int, optional): 去重的最小子树大小，见 convert. 默认为 None.
+        pointer (str, optional): JSON Pointer，每个文件都只转换该子树，
+            见 convert. 默认为 None.
+        level (int, optional): .yaml.gz/.yaml.zst 的压缩级别，见 open_file.
+            默认为 None.
+        threads (int, optional): zstd 压缩线程数，见 open_file. 默认为 None.
+
+    Returns:
+        dict: 汇总 {"files", "failed", "bytes", "seconds"}
+    """
+    if out_dir is None:
+        out_dir = in_dir
+
+    tasks = []
+    for root, dirs, files in os.walk(in_dir):
+        for file in sorted(files):
+            name = file.lower()
+            suffix = next(
+                (s for s in COMPRESSED_SUFFIXES if name.endswith(s)), "")
+            if name[:len(name) - len(suffix)].endswith(".json"):
+                in_file = os.path.join(root, file)
+                rel_path = os.path.relpath(in_file, in_dir)
+                stem = rel_path[:len(rel_path) - len(suffix) - 5]
+                out_file = os.path.join(
+                    out_dir, stem + ".yaml" + rel_path[len(stem) + 5:])
+                tasks.append((in_file, out_file))
+
+    summary = {"files": 0, "failed": 0, "bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(convert_file, in_file, out_file, stream,
+                            dedupe_size, pointer, level, threads)
+            for in_file, out_file in tasks
+        ]
+        for future in as_completed(futures):
+            in_file, size, seconds, error = future.result()
+            summary["files"] += 1
+            summary["bytes"] += size
+            if error:
+                summary["failed"] += 1
+                print(f"FAIL {in_file}: {error}", flush=True)
+            else:
+                print(f"OK   {in_file} {size:,} bytes {seconds:.3f}s",
+                      flush=True)
+    summary["seconds"] = time.perf_counter() - start
+
+    print(f"共 {summary['files']} 个文件，失败 {summary['failed']} 个，"
+          f"{summary['bytes']:,} 字节，耗时 {summary['seconds']:.2f} 秒。")
+    return summary
+
+
+def check_num(value: str) -> int:
+    """验证值在允许范围内,要求大于0。
+
+    Args:
+        value (str): 要验证的整数。
+
+    Raises:
+        argparse.ArgumentTypeError: 如果值超出了允许范围抛出。
+
+    Returns:
+        int: 范围内的有效整数。
+    """
+    value = int(value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            f"{value} is an invalid value,must be greater than 0")
+    return value
 
 
 def get_parameter() -> argparse.Namespace:
@@ -74,18 +695,32 @@ def get_parameter() -> argparse.Namespace:
         if args.version:
             return
 
-        if not os.path.exists(args.in_file) or not os.path.isfile(
+        if args.dedupe is not None and (args.stream
+                                        or args.input_format == "jsonl"):
+            parser.error("--dedupe cannot be used with --stream or jsonl")
+
+        if args.pointer and args.input_format == "jsonl":
+            parser.error("--pointer cannot be used with jsonl")
+
+        if args.in_dir:
+            if args.input_format == "jsonl":
+                parser.error("-id cannot be used with jsonl")
+            if not os.path.isdir(args.in_dir):
+                parser.error(
+                    "No directory or does not exist,-id must be the json "
+                    "directory path")
+            return
+
+        if not args.in_file or not os.path.exists(args.in_file) or not os.path.isfile(
                 args.in_file):
             parser.error(
                 "No file or does not exist,-if must be the csv file path")
 
         if not args.out_file:
             args.out_file = args.in_file + ".json"
-        else:
-            if not os.path.exists(args.out_file) or os.path.isfile(
-                    args.out_file):
-                parser.error(
-                    "No file or does not exist,-of must be the json file path")
+        elif os.path.isdir(args.out_file):
+            # 输出文件可以不存在，只要不是目录
+            parser.error("-of must be the yaml file path, not a directory")
 
     parser = argparse.ArgumentParser(prog=f"{__Name__}",
                                      description=f"{__Description__}",
@@ -96,6 +731,46 @@ def get_parameter() -> argparse.Namespace:
                         help="increase output version")
     parser.add_argument("-if", "--in_file", help="input csv file path")
     parser.add_argument("-of", "--out_file", help="out json file path")
+    parser.add_argument("-s",
+                        "--stream",
+                        action="store_true",
+                        help="convert top-level array items or object members "
+                        "one at a time to bound memory")
+    parser.add_argument("--input-format",
+                        choices=["json", "jsonl"],
+                        default="json",
+                        help="jsonl reads one document per line and writes a "
+                        "multi-document YAML stream (default: json)")
+    parser.add_argument("-d",
+                        "--dedupe",
+                        nargs="?",
+                        const=64,
+                        type=check_num,
+                        metavar="MIN_SIZE",
+                        help="emit anchors/aliases for repeated subtrees of at "
+                        "least MIN_SIZE JSON characters (default: 64)")
+    parser.add_argument("-p",
+                        "--pointer",
+                        help="JSON Pointer of the subtree to convert, "
+                        "e.g. /spec/templates")
+    parser.add_argument("-id",
+                        "--in_dir",
+                        help="convert every .json file under this directory")
+    parser.add_argument("-od",
+                        "--out_dir",
+                        help="output directory for -id (default: in_dir)")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=check_num,
+                        help="worker processes for -id and jsonl input "
+                        "(default: CPU count)")
+    parser.add_argument("--level",
+                        type=int,
+                        help="compression level for .gz (0-9) or .zst "
+                        "(up to 22) output")
+    parser.add_argument("--threads",
+                        type=check_num,
+                        help="zstd compression threads for .zst output")
 
     args = parser.parse_args()
     check_restraint(parser, args)
@@ -107,5 +782,23 @@ if __name__ == '__main__':
     args = get_parameter()
     if args.version:
         get_version()
+    elif args.in_dir:
+        summary = convert_dir(args.in_dir, args.out_dir, args.jobs,
+                              args.stream, args.dedupe, args.pointer,
+                              args.level, args.threads)
+        sys.exit(1 if summary["failed"] else 0)
+    elif args.input_format == "jsonl":
+        convert_jsonl(args.in_file,
+                      args.out_file,
+                      args.jobs,
+                      level=args.level,
+                      threads=args.threads)
+        print(f"JSON Lines 文件已使用 {YAML_BACKEND} 转换为 YAML 格式，"
+              f"并保存在 {args.out_file} 中。")
     else:
-        convert(args.in_file, args.out_file)
+        saved = convert(args.in_file, args.out_file, args.stream,
+                        args.dedupe, args.pointer, args.level, args.threads)
+        print(f"JSON 文件已使用 {YAML_BACKEND} 转换为 YAML 格式，"
+              f"并保存在 {args.out_file} 中。")
+        if args.dedupe is not None:
+            print(f"去重约节省 {saved:,} 字节。")
@@ -10,9 +10,34 @@
 ---version 0.2.0---
 @Time           : 2024/01/23
 @Description    : 添加命令行支持
+---version 0.3.0---
+@Time           : 2026/10/18
+@Description    : 添加 --jobs 线程池并行列目录，输出顺序不变
+---version 0.4.0---
+@Time           : 2026/10/18
+@Description    : 改为显式栈遍历，添加 --max-depth/--max-entries/--dir-limit
+---version 0.5.0---
+@Time           : 2026/10/18
+@Description    : 添加 --sizes/--top，遍历时顺带汇总目录大小
+---version 0.6.0---
+@Time           : 2026/10/18
+@Description    : --exclude 支持 glob/gitignore 模式，添加 --gitignore
+---version 0.7.0---
+@Time           : 2026/10/18
+@Description    : 添加 --format ndjson/json/text，缓冲写出
+---version 0.8.0---
+@Time           : 2026/10/18
+@Description    : 添加 --snapshot/--since，基于 Merkle 哈希找出变化的子树
 '''
 import os
+import re
+import sys
+import json
+import heapq
+import hashlib
 import argparse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 __Author__ = "zouzhao"
 __Name__ = "tree"
@@ -29,37 +54,712 @@ def get_version() -> str:
     print(f"{__Author__} {__Name__} {__Version__} \n{__License__}")
 
 
-def tree(directory: str, exclude_dirs: str = None):
-    """遍历并打印目标目录
+# 遍历结果节点，entry 为 None 时表示被 --dir-limit 截断的 omitted 个条目
+Node = namedtuple("Node", ["level", "entry", "omitted"])
+
+
+def translate_pattern(pattern: str) -> tuple:
+    """gitignore 模式转为正则表达式
+
+    支持 *、?、[...]、**、取反 !、结尾 / 仅匹配目录、含 / 时相对根目录匹配。
+
+    Args:
+        pattern (str): gitignore 模式
+
+    Returns:
+        tuple: (正则表达式, 是否取反)，空行和注释返回 None
+    """
+    pattern = pattern.rstrip("\r\n")
+    if not pattern.strip() or pattern.startswith("#"):
+        return None
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip()
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    body = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+            if i + 2 == n:
+                # 结尾的 /** 匹配目录下的所有内容
+                body.append(".+" if i else ".*")
+                i += 2
+                continue
+            if pattern[i + 2] == "/":
+                # 开头的 **/ 和中间的 /**/ 匹配零或多级目录
+                body.append("(?:.*/)?")
+                i += 3
+                continue
+        if c == "*":
+            body.append("[^/]*")
+        elif c == "?":
+            body.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                body.append("\\[")
+            else:
+                chars = pattern[i + 1:j].replace("\\", "\\\\").replace(
+                    "[", "\\[")
+                if chars[0] in "!^":
+                    chars = "^" + chars[1:]
+                body.append(f"[{chars}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            body.append(re.escape(pattern[i]))
+        else:
+            body.append(re.escape(c))
+        i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    suffix = "/" if dir_only else "/?"
+    return f"{prefix}{''.join(body)}{suffix}", negate
+
+
+def compile_excludes(patterns: list):
+    """把全部排除模式编译为一个正则，返回判断函数
+
+    模式按 gitignore 的规则处理，后出现的模式优先，因此逆序拼接后
+    第一个命中的分支即为生效的模式。
+
+    Args:
+        patterns (list): gitignore 模式列表
+
+    Returns:
+        callable: is_excluded(rel_path, is_dir) -> bool，没有有效模式时返回 None
+    """
+    rules = [r for r in map(translate_pattern, patterns) if r is not None]
+    if not rules:
+        return None
+
+    if not any(negate for _, negate in rules):
+        match = re.compile("|".join(regex for regex, _ in rules)).fullmatch
+
+        def is_excluded(rel_path: str, is_dir: bool) -> bool:
+            return match(rel_path + "/" if is_dir else rel_path) is not None
+
+        return is_excluded
+
+    rules.reverse()
+    match = re.compile("|".join(
+        f"(?P<p{i}>{regex})" for i, (regex, _) in enumerate(rules))).fullmatch
+    negated = {f"p{i}" for i, (_, negate) in enumerate(rules) if negate}
+
+    def is_excluded(rel_path: str, is_dir: bool) -> bool:
+        m = match(rel_path + "/" if is_dir else rel_path)
+        return m is not None and m.lastgroup not in negated
+
+    return is_excluded
+
+
+def read_gitignore(file_path: str) -> list:
+    """读取 .gitignore 文件中的模式
+
+    Args:
+        file_path (str): .gitignore 路径
+
+    Returns:
+        list: 模式列表
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        return file.read().splitlines()
+
+
+def scan_dir(dir_path: str,
+             is_excluded=None,
+             with_stat: bool = False,
+             root_len: int = 0) -> list:
+    """列出目录下需要展示的目录项，并在当前线程中预取类型信息
+
+    Args:
+        dir_path (str): 目标目录
+        is_excluded (callable, optional): compile_excludes 返回的判断函数，
+            被排除的目录不会被列出，也就不会被遍历. 默认为 None.
+        with_stat (bool, optional): 是否预取目录项的 stat 结果，
+            os.DirEntry 会缓存该结果. 默认为 False.
+        root_len (int, optional): 根目录前缀长度，用于得到匹配用的相对路径. 默认为 0.
+
+    Returns:
+        list: os.DirEntry 列表，保持 os.scandir 的顺序
+    """
+    entries = []
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            # 网络文件系统上 d_type 可能缺失，这里顺带完成 stat
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if not is_dir and not entry.is_file():
+                continue
+            if is_excluded is not None:
+                rel_path = entry.path[root_len:]
+                if os.sep != "/":
+                    rel_path = rel_path.replace(os.sep, "/")
+                if is_excluded(rel_path, is_dir):
+                    continue
+            if with_stat:
+                entry.stat(follow_symlinks=False)
+            entries.append(entry)
+    return entries
+
+
+def iter_tree(directory: str,
+              exclude_dirs: list = None,
+              jobs: int = 1,
+              max_depth: int = None,
+              max_entries: int = None,
+              dir_limit: int = None,
+              stats: dict = None,
+              with_stat: bool = False,
+              exclude: list = None):
+    """以显式栈深度优先遍历目录，按打印顺序逐个产出节点
 
     Args:
         directory (str): 目标目录
-        exclude_dirs (str, optional): 排除目录. 默认为 None.
+        exclude_dirs (list, optional): 排除的目录名. 默认为 None.
+        jobs (int, optional): 列目录线程数，大于 1 时并行预取子目录. 默认为 1.
+        max_depth (int, optional): 最多展示的层数，超出的目录不再展开. 默认为 None.
+        max_entries (int, optional): 最多展示的条目数，达到后提前结束. 默认为 None.
+        dir_limit (int, optional): 每个目录最多展示的条目数. 默认为 None.
+        stats (dict, optional): 传入时写回统计信息：entries 已展示条目数，
+            omitted 跳过的条目数，unexpanded 未展开的目录数，stopped 是否提前结束.
+        with_stat (bool, optional): 是否在列目录时预取目录项的 stat 结果. 默认为 False.
+        exclude (list, optional): gitignore 模式，相对 directory 匹配. 默认为 None.
+
+    Yields:
+        Node: 遍历节点
     """
     if exclude_dirs is None:
         exclude_dirs = []
+    if exclude is None:
+        exclude = []
+    if stats is None:
+        stats = {}
+    stats.update(entries=0, omitted=0, unexpanded=0, stopped=False)
+
+    # 目录名按字面量匹配，转义后与其余模式一起编译
+    patterns = [re.sub(r"([*?\[\\!#])", r"\\\1", name) + "/"
+                for name in exclude_dirs]
+    scan_args = (compile_excludes(patterns + list(exclude)), with_stat,
+                 len(os.path.join(directory, "")))
+
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending = {}
+
+    def expandable(level: int) -> bool:
+        return max_depth is None or level < max_depth
 
-    def inner(dir_path: str, level: int = 0):
-        """遍历并打印目标目录
+    def listing(dir_path: str, level: int):
+        """取得目录的节点迭代器，并行模式下顺带提交子目录的列目录任务
 
         Args:
             dir_path (str): 目标目录
-            level (int, optional): 缩减. 默认为 0.
+            level (int): 目录项所在层级
+
+        Returns:
+            iterator: 节点迭代器
+        """
+        if pool is None:
+            entries = scan_dir(dir_path, *scan_args)
+        else:
+            entries = pending.pop(dir_path).result()
+
+        omitted = 0
+        if dir_limit is not None and len(entries) > dir_limit:
+            omitted = len(entries) - dir_limit
+            entries = entries[:dir_limit]
+
+        if pool is not None and expandable(level + 1):
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending[entry.path] = pool.submit(scan_dir, entry.path,
+                                                      *scan_args)
+
+        nodes = [Node(level, entry, 0) for entry in entries]
+        if omitted:
+            nodes.append(Node(level, None, omitted))
+        return iter(nodes)
+
+    try:
+        if pool is not None:
+            pending[directory] = pool.submit(scan_dir, directory,
+                                             *scan_args)
+        stack = [listing(directory, 0)]
+
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+
+            if node.entry is None:
+                stats["omitted"] += node.omitted
+                yield node
+                continue
+
+            if max_entries is not None and stats["entries"] >= max_entries:
+                # 已列出但未展示的条目也计入跳过数
+                stats["stopped"] = True
+                stats["omitted"] += 1
+                for nodes in stack:
+                    for rest in nodes:
+                        stats["omitted"] += rest.omitted or 1
+                break
+
+            stats["entries"] += 1
+            yield node
+
+            if node.entry.is_dir(follow_symlinks=False):
+                if expandable(node.level + 1):
+                    stack.append(listing(node.entry.path, node.level + 1))
+                else:
+                    stats["unexpanded"] += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_sizes(nodes, directory: str):
+    """汇总 iter_tree 的节点，按后序逐个产出目录的大小，与 du 的输出顺序一致
+
+    Args:
+        nodes: iter_tree 产出的节点，需以 with_stat=True 遍历
+        directory (str): 遍历的根目录
+
+    Yields:
+        tuple: (目录路径, 文件总字节数, 文件总数)，只统计实际遍历到的文件
+    """
+    # 栈中第 i 项累加第 i 层的条目，即当前路径上各目录的小计
+    totals = [[directory, 0, 0]]
+    for node in nodes:
+        while len(totals) > node.level + 1:
+            path, size, files = totals.pop()
+            totals[-1][1] += size
+            totals[-1][2] += files
+            yield path, size, files
+
+        if node.entry is None:
+            continue
+        if node.entry.is_dir(follow_symlinks=False):
+            totals.append([node.entry.path, 0, 0])
+        else:
+            totals[-1][1] += node.entry.stat(follow_symlinks=False).st_size
+            totals[-1][2] += 1
+
+    while totals:
+        path, size, files = totals.pop()
+        if totals:
+            totals[-1][1] += size
+            totals[-1][2] += files
+        yield path, size, files
+
+
+def format_size(size: int) -> str:
+    """字节数转为 du -h 风格的可读形式
+
+    Args:
+        size (int): 字节数
+
+    Returns:
+        str: 可读大小，如 1.5K、20M
+    """
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            break
+        size /= 1024
+    if unit == "B":
+        return f"{size}{unit}"
+    return f"{size:.1f}{unit}" if size < 10 else f"{size:.0f}{unit}"
+
+
+class TreeWriter:
+    """按 text/ndjson/json 格式缓冲写出，攒够 buffer_size 个字符才写一次
+    """
+
+    def __init__(self, out=None, fmt: str = "text", buffer_size: int = 1 << 16):
+        """
+        Args:
+            out (optional): 输出流. 默认为 sys.stdout.
+            fmt (str, optional): text、ndjson 或 json. 默认为 "text".
+            buffer_size (int, optional): 缓冲的字符数. 默认为 1 << 16.
+        """
+        self.out = sys.stdout if out is None else out
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.records = 0
+
+    def write(self, text: str) -> None:
+        """写入文本
+
+        Args:
+            text (str): 文本
+        """
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+
+    def line(self, text: str) -> None:
+        """写入一行文本
+
+        Args:
+            text (str): 不含换行符的文本
+        """
+        self.write(text + "\n")
+
+    def record(self, record: dict) -> None:
+        """写入一条记录，json 格式下作为数组元素逐条写出，不在内存中攒整个数组
+
+        Args:
+            record (dict): 记录
+        """
+        data = json.dumps(record)
+        if self.fmt == "json":
+            self.write(("[\n" if self.records == 0 else ",\n") + data)
+        else:
+            self.write(data + "\n")
+        self.records += 1
+
+    def flush(self) -> None:
+        """把缓冲写入输出流
+        """
+        self.out.write("".join(self.buffer))
+        self.buffer = []
+        self.buffered = 0
+
+    def close(self) -> None:
+        """结束输出，json 格式下补上数组结尾
         """
-        # 遍历目录
-        for entry in os.scandir(dir_path):
-            if entry.is_dir(
-                    follow_symlinks=False) and entry.name not in exclude_dirs:
-                indent = "  " * level
-                print(f"{indent}{entry.name}/")
+        if self.fmt == "json":
+            self.write("\n]\n" if self.records else "[]\n")
+        self.flush()
+        self.out.flush()
+
+
+def node_record(node: Node) -> dict:
+    """节点转为 ndjson/json 记录
+
+    Args:
+        node (Node): iter_tree 产出的节点，需以 with_stat=True 遍历
+
+    Returns:
+        dict: 记录
+    """
+    if node.entry is None:
+        return {"depth": node.level, "type": "omitted", "count": node.omitted}
+
+    st = node.entry.stat(follow_symlinks=False)
+    return {
+        "path": node.entry.path,
+        "depth": node.level,
+        "type": "dir" if node.entry.is_dir(follow_symlinks=False) else "file",
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+    }
+
+
+def tree(directory: str,
+         exclude_dirs: str = None,
+         jobs: int = 1,
+         max_depth: int = None,
+         max_entries: int = None,
+         dir_limit: int = None,
+         sizes: bool = False,
+         top: int = None,
+         exclude: list = None,
+         fmt: str = "text",
+         out=None):
+    """遍历并打印目标目录
+
+    Args:
+        directory (str): 目标目录
+        exclude_dirs (str, optional): 排除的目录名. 默认为 None.
+        jobs (int, optional): 列目录线程数，大于 1 时并行预取子目录. 默认为 1.
+        max_depth (int, optional): 最多展示的层数. 默认为 None.
+        max_entries (int, optional): 最多展示的条目数. 默认为 None.
+        dir_limit (int, optional): 每个目录最多展示的条目数. 默认为 None.
+        sizes (bool, optional): 改为按 du 的格式打印每个目录的大小和文件数. 默认为 False.
+        top (int, optional): 最后打印最大的 top 个子树. 默认为 None.
+        exclude (list, optional): gitignore 模式，命中的文件和目录不展示，
+            目录也不会被遍历. 默认为 None.
+        fmt (str, optional): text 为缩进文本，ndjson 每行一条记录，
+            json 为记录数组，均随遍历流式写出. 默认为 "text".
+        out (optional): 输出流. 默认为 sys.stdout.
+    """
+    text = fmt == "text"
+    writer = TreeWriter(out, fmt)
+    stats = {}
+    nodes = iter_tree(directory,
+                      exclude_dirs=exclude_dirs,
+                      jobs=jobs,
+                      max_depth=max_depth,
+                      max_entries=max_entries,
+                      dir_limit=dir_limit,
+                      stats=stats,
+                      with_stat=sizes or bool(top) or not text,
+                      exclude=exclude)
+
+    if sizes or top:
+        # 小根堆只保留最大的 top 个子树
+        heaviest = []
+        for path, size, files in iter_sizes(nodes, directory):
+            if sizes and text:
+                writer.line(f"{format_size(size):>6}  {files:>9,}  {path}")
+            elif sizes:
+                writer.record({"path": path, "size": size, "files": files})
+            if not top:
+                continue
+            if len(heaviest) < top:
+                heapq.heappush(heaviest, (size, files, path))
+            else:
+                heapq.heappushpop(heaviest, (size, files, path))
+
+        if top and text:
+            if sizes:
+                writer.line("")
+            writer.line(f"Top {len(heaviest)} subtrees by size:")
+        if top:
+            ranked = sorted(heaviest, reverse=True)
+            for rank, (size, files, path) in enumerate(ranked, 1):
+                if text:
+                    writer.line(f"{format_size(size):>6}  {files:>9,}  {path}")
+                else:
+                    writer.record({
+                        "rank": rank,
+                        "path": path,
+                        "size": size,
+                        "files": files
+                    })
+        nodes = ()
+
+    for node in nodes:
+        if not text:
+            writer.record(node_record(node))
+            continue
+
+        indent = "  " * node.level
+        if node.entry is None:
+            writer.line(f"{indent}… and {node.omitted:,} more")
+        elif node.entry.is_dir(follow_symlinks=False):
+            writer.line(f"{indent}{node.entry.name}/")
+        else:
+            writer.line(f"{indent}{node.entry.name}")
+
+    # 有条目被跳过时给出汇总，避免误以为已展示全部内容
+    if stats["omitted"] or stats["unexpanded"]:
+        summary = [f"{stats['entries']:,} entries shown"]
+        if stats["omitted"]:
+            summary.append(f"{stats['omitted']:,} skipped")
+        if stats["unexpanded"]:
+            summary.append(
+                f"{stats['unexpanded']:,} directories not expanded")
+        if stats["stopped"]:
+            summary.append("stopped at --max-entries")
+        # 机器可读格式下汇总写到 stderr，不破坏输出的结构
+        if text:
+            writer.line(f"\n[{', '.join(summary)}]")
+        else:
+            writer.flush()
+            print(f"[{', '.join(summary)}]", file=sys.stderr)
+
+    writer.close()
+
+
+def hash_dir(files: list, dirs: list) -> str:
+    """计算目录自身条目的哈希，只看文件名、大小、修改时间和子目录名
+
+    Args:
+        files (list): (文件名, 大小, 修改时间 ns) 列表
+        dirs (list): 子目录名列表
+
+    Returns:
+        str: 十六进制哈希
+    """
+    digest = hashlib.sha1()
+    for name, size, mtime in sorted(files):
+        digest.update(f"f {name}\0{size}\0{mtime}\n".encode("utf-8",
+                                                            "surrogatepass"))
+    for name in sorted(dirs):
+        digest.update(f"d {name}\n".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def snapshot(directory: str,
+             previous: dict = None,
+             exclude: list = None,
+             verify: bool = False,
+             changes: list = None) -> dict:
+    """生成目录的 Merkle 快照，可与上一次快照比较
+
+    每个目录记录 [修改时间 ns, 自身条目哈希, 子树哈希, 子目录名列表]，
+    子树哈希由自身条目哈希和各子目录的子树哈希组成。
+
+    提供 previous 时，修改时间与快照一致的目录不再列目录，直接沿用快照中
+    的条目哈希和子目录，只 stat 各子目录，工作量与变化量成正比。
+    目录的修改时间只随条目的增删改名变化，原地改写文件内容不会体现，
+    需要发现这类变化时传入 verify=True 重新列出全部目录。
+
+    Args:
+        directory (str): 目标目录
+        previous (dict, optional): 上一次的快照. 默认为 None.
+        exclude (list, optional): gitignore 模式. 默认为 None.
+        verify (bool, optional): 忽略修改时间，重新列出全部目录. 默认为 False.
+        changes (list, optional): 传入时追加 (变化类型, 相对路径)，
+            A 新增目录，M 目录条目有变化，D 删除目录，新增目录的子目录不再重复列出.
+
+    Returns:
+        dict: 快照 {"root": directory, "dirs": {相对路径: [...]}}，根目录为 ""
+    """
+    is_excluded = compile_excludes(exclude or [])
+    old_dirs = previous["dirs"] if previous else {}
+    if changes is None:
+        changes = []
+    dirs = {}
+
+    def visit(rel: str, path: str, st: os.stat_result, added: bool) -> list:
+        """取得目录的修改时间、条目哈希和子目录，必要时列目录并记录变化
+
+        Returns:
+            list: [rel, path, 修改时间 ns, 条目哈希, 子目录名列表, 子树哈希列表, added]
+        """
+        old = old_dirs.get(rel)
+        if old is not None and not verify and old[0] == st.st_mtime_ns:
+            return [rel, path, st.st_mtime_ns, old[1], old[3], [], added]
+
+        files, subdirs = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+                child = f"{rel}/{entry.name}" if rel else entry.name
+                if is_excluded is not None and is_excluded(child, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append(entry.name)
+                else:
+                    entry_st = entry.stat(follow_symlinks=False)
+                    files.append(
+                        (entry.name, entry_st.st_size, entry_st.st_mtime_ns))
+
+        local = hash_dir(files, subdirs)
+        if previous is not None:
+            if old is None:
+                if not added:
+                    changes.append(("A", rel))
+                added = True
+            elif old[1] != local:
+                changes.append(("M", rel))
+            if old is not None:
+                for name in sorted(set(old[3]) - set(subdirs)):
+                    changes.append(("D", f"{rel}/{name}" if rel else name))
+        return [rel, path, st.st_mtime_ns, local, sorted(subdirs), [], added]
+
+    # 显式栈后序遍历，frame 中记录下一个要访问的子目录下标
+    stack = [visit("", directory, os.stat(directory), False) + [0]]
+    while stack:
+        frame = stack[-1]
+        rel, path, mtime, local, subdirs, child_hashes, added, index = frame
+        if index < len(subdirs):
+            frame[7] += 1
+            name = subdirs[index]
+            child_rel = f"{rel}/{name}" if rel else name
+            child_path = os.path.join(path, name)
+            try:
+                st = os.lstat(child_path)
+            except FileNotFoundError:
+                # 快照中记录的子目录在遍历期间被删除
+                changes.append(("D", child_rel))
+                continue
+            stack.append(visit(child_rel, child_path, st, added) + [0])
+            continue
+
+        stack.pop()
+        digest = hashlib.sha1(local.encode("ascii"))
+        for name, child_hash in zip(subdirs, child_hashes):
+            digest.update(f"{name}\0{child_hash}\n".encode(
+                "utf-8", "surrogatepass"))
+        tree_hash = digest.hexdigest()
+        dirs[rel] = [mtime, local, tree_hash, subdirs]
+        if stack:
+            stack[-1][5].append(tree_hash)
+
+    return {"root": directory, "dirs": dirs}
 
-                # 递归进入子目录
-                inner(entry.path, level + 1)
-            elif entry.is_file():
-                indent = "  " * level
-                print(f"{indent}{entry.name}")
 
-    inner(directory)
+def load_snapshot(file_path: str) -> dict:
+    """读取快照文件
+
+    Args:
+        file_path (str): 快照路径
+
+    Returns:
+        dict: 快照
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_snapshot(data: dict, file_path: str) -> None:
+    """保存快照文件
+
+    Args:
+        data (dict): 快照
+        file_path (str): 快照路径
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+
+
+def print_changes(changes: list, fmt: str = "text", out=None) -> None:
+    """打印与快照相比有变化的子树
+
+    Args:
+        changes (list): snapshot 收集的 (变化类型, 相对路径)
+        fmt (str, optional): text、ndjson 或 json. 默认为 "text".
+        out (optional): 输出流. 默认为 sys.stdout.
+    """
+    writer = TreeWriter(out, fmt)
+    for change, rel in changes:
+        if fmt == "text":
+            writer.line(f"{change}  {rel or '.'}/")
+        else:
+            writer.record({"path": rel or ".", "change": change})
+    writer.close()
+
+
+def check_num(value: str) -> int:
+    """验证值在允许范围内,要求大于0。
+
+    Args:
+        value (str): 要验证的整数。
+
+    Raises:
+        argparse.ArgumentTypeError: 如果值超出了允许范围抛出。
+
+    Returns:
+        int: 范围内的有效整数。
+    """
+    value = int(value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            f"{value} is an invalid value,must be greater than 0")
+    return value
 
 
 def get_parameter() -> argparse.Namespace:
@@ -86,7 +786,70 @@ def get_parameter() -> argparse.Namespace:
         "-e",
         action="append",
         default=[],
-        help="Directories to exclude )",
+        help="Glob or gitignore pattern to exclude, may be repeated",
+    )
+    parser.add_argument(
+        "--gitignore",
+        nargs="?",
+        const="",
+        help="Also exclude patterns read from FILE "
+        "(default: DIRECTORY/.gitignore)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=check_num,
+        default=1,
+        help="Threads used to list directories in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--max-depth",
+        "-L",
+        type=check_num,
+        help="Descend at most this many levels",
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=check_num,
+        help="Stop after printing this many entries",
+    )
+    parser.add_argument(
+        "--dir-limit",
+        type=check_num,
+        help="Print at most this many entries per directory",
+    )
+    parser.add_argument(
+        "--sizes",
+        "-s",
+        action="store_true",
+        help="Print du-style size and file count of every directory",
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=["text", "ndjson", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILE",
+        help="Save per-directory Merkle hashes to FILE",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="FILE",
+        help="Print only the subtrees changed since the snapshot in FILE",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="With --since, re-list directories whose mtime is unchanged",
+    )
+    parser.add_argument(
+        "--top",
+        type=check_num,
+        help="Print the N largest subtrees",
     )
 
     args = parser.parse_args()
@@ -98,4 +861,29 @@ if __name__ == "__main__":
     if args.version:
         get_version()
     else:
-        tree(args.directory, exclude_dirs=args.exclude)
+        exclude = args.exclude
+        if args.gitignore is not None:
+            exclude += read_gitignore(
+                args.gitignore
+                or os.path.join(args.directory, ".gitignore"))
+
+        if args.snapshot or args.since:
+            changes = []
+            previous = load_snapshot(args.since) if args.since else None
+            data = snapshot(args.directory, previous, exclude, args.verify,
+                            changes)
+            if args.since:
+                print_changes(changes, args.format)
+            if args.snapshot:
+                save_snapshot(data, args.snapshot)
+            sys.exit(0)
+
+        tree(args.directory,
+             exclude=exclude,
+             jobs=args.jobs,
+             max_depth=args.max_depth,
+             max_entries=args.max_entries,
+             dir_limit=args.dir_limit,
+             sizes=args.sizes,
+             top=args.top,
+             fmt=args.format)
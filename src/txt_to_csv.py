@@ -22,11 +22,50 @@ eg:
 ---Version 0.2.0---
 @Time           : 2024/01/22
 @Description    : 添加命令行支持
+---Version 0.3.0---
+@Time           : 2026/10/18
+@Description    : parse_blocks 改为生成器，convert 逐块流式写出 csv
+---Version 0.4.0---
+@Time           : 2026/10/18
+@Description    : 添加 -j/--jobs，mmap 按空行切块后用进程池并行解析
+---Version 0.5.0---
+@Time           : 2026/10/18
+@Description    : 添加 --dedup first/last/concat，内存只保存键的哈希，
+                  超出预算时转存到 SQLite；命令行默认 --dedup last，与原来的
+                  输出一致，--dedup none 每块各写一行
 """
 
+import io
+import os
+import re
 import csv
 import sys
+import mmap
+import sqlite3
+import hashlib
 import argparse
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
+
+# 输出 csv 的格式
+CSV_PARAMS = {
+    "delimiter": ",",
+    "quotechar": '"',
+    "quoting": csv.QUOTE_ALL,
+}
+
+# 只含 ASCII 空白的空行，一定是块的分界；全角空格等组成的空行不用于切块，
+# 只会让块变大，不影响结果
+BLANK_LINE = re.compile(rb"\n[ \t\r\f\v]*\n")
+
+# 二进制读取时按 \r\n、\r、\n 拆行，与文本方式打开时的换行识别一致
+LINE = re.compile(rb"[^\r\n]*(?:\r\n?|\n)|[^\r\n]+")
+
+# 内存中每个键的估算开销（哈希对象加字典槽位）和每多一个偏移的开销
+KEY_BYTES = 120
+OFFSET_BYTES = 40
 
 __Author__ = "zouzhao"
 __Name__ = "txtToCsv"
@@ -43,35 +82,404 @@ def get_version() -> str:
     print(f"{__Author__} {__Name__} {__Version__} \n{__License__}")
 
 
-def parse_blocks(file_path: str) -> list:
-    """解析文本，文本格式使用换行分割块
+def iter_blocks(lines: Iterable[str]) -> Iterator[List[str]]:
+    """按空行把行分成块，逐块产出
 
     Args:
-        file_path (str): 文件路径
+        lines (Iterable[str]): 行，通常是文本文件对象
 
-    Returns:
-        list: 行组成的列表
+    Yields:
+        List[str]: 一个块的非空行，已去掉首尾空白
     """
-    blocks = []
     current_block = []
 
+    for line in lines:
+        line = line.strip()
+
+        if line:
+            # 如果不是空行，则将该行添加到当前块中
+            current_block.append(line)
+        elif current_block:
+            # 如果是空行，并且当前块不为空，则产出当前块
+            yield current_block
+            current_block = []
+
+    # 产出最后一个块（如果存在）
+    if current_block:
+        yield current_block
+
+
+def parse_blocks(file_path: str) -> Iterator[List[str]]:
+    """解析文本，文本格式使用换行分割块，逐块产出，不保留已产出的块
+
+    Args:
+        file_path (str): 文件路径
+
+    Yields:
+        List[str]: 一个块的非空行
+    """
     with open(file_path, "r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
+        yield from iter_blocks(file)
+
+
+def convert(in_path: str, out_path: str) -> int:
+    """文本转 csv，每个块解析完立即写出一行，内存占用与文件大小无关
+    注：不按键去重，重复的键各写一行；命令行默认用 convert_dedup 的 "last"，
+    与原来的输出一致
+
+    Args:
+        in_path (str): 文本路径
+        out_path (str): csv 路径
+
+    Returns:
+        int: 写出的行数
+    """
+    count = 0
+    with open(out_path, "w", encoding="utf-8", newline="") as file_obj:
+        writer = csv.writer(file_obj, **CSV_PARAMS)
+        for block in parse_blocks(in_path):
+            writer.writerow((block[0], "".join(block[1:])))
+            count += 1
+    return count
+
 
+def iter_blocks_at(file) -> Iterator[Tuple[int, List[str]]]:
+    """按空行分块，同时给出块在文件中的字节偏移，用于之后回读
+
+    Args:
+        file: 以二进制方式打开的文件，从当前位置开始读
+
+    Yields:
+        Tuple[int, List[str]]: (块第一行的偏移, 块的非空行)
+    """
+    offset = file.tell()
+    start = offset
+    current_block = []
+
+    for raw in file:
+        # 只有行尾有 \r 时不必再拆
+        pieces = (raw, ) if raw.find(b"\r", 0, -2) == -1 else LINE.findall(raw)
+        for piece in pieces:
+            line = piece.decode("utf-8").strip()
             if line:
-                # 如果不是空行，则将该行添加到当前块中
+                if not current_block:
+                    start = offset
                 current_block.append(line)
             elif current_block:
-                # 如果是空行，并且当前块不为空，则将当前块添加到块列表中
-                blocks.append(current_block)
+                yield start, current_block
                 current_block = []
+            offset += len(piece)
 
-    # 添加最后一个块（如果存在）
     if current_block:
-        blocks.append(current_block)
+        yield start, current_block
+
+
+class KeyIndex:
+    """键到块偏移的索引，按键第一次出现的顺序遍历
+
+    内存中只保存键的 blake2b 哈希和偏移，估算占用超过预算时整体转存到
+    SQLite 临时库，之后的键都在库中查找和更新。
+    """
+
+    def __init__(self, keep: str, budget: int = 256 << 20):
+        """
+        Args:
+            keep (str): "first" 不保存偏移，"last" 保存最后一次出现的偏移，
+                "all" 保存每次出现的偏移
+            budget (int, optional): 内存预算字节数. 默认为 256 MiB.
+        """
+        self.keep = keep
+        self.budget = budget
+        self.size = 0
+        self.keys = set() if keep == "first" else {}
+        self.db = None
+        self.tmp_dir = None
+        self.seq = 0
+
+    @property
+    def spilled(self) -> bool:
+        """是否已转存到 SQLite"""
+        return self.db is not None
+
+    def add(self, key: str, offset: int = None) -> bool:
+        """记录一次出现
+
+        Args:
+            key (str): 键
+            offset (int, optional): 块的偏移，keep 为 "first" 时不需要.
+                默认为 None.
+
+        Returns:
+            bool: 是否第一次出现
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        self.seq += 1
+        if self.db is not None:
+            return self._add_db(digest, offset)
+
+        if self.keep == "first":
+            new = digest not in self.keys
+            if new:
+                self.keys.add(digest)
+                self.size += KEY_BYTES
+        else:
+            offsets = self.keys.get(digest)
+            new = offsets is None
+            if new:
+                self.keys[digest] = [offset]
+                self.size += KEY_BYTES
+            elif self.keep == "last":
+                offsets[0] = offset
+            else:
+                offsets.append(offset)
+                self.size += OFFSET_BYTES
+
+        if self.size > self.budget:
+            self._spill()
+        return new
+
+    def _spill(self) -> None:
+        """把内存中的索引转存到 SQLite，释放内存"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db = sqlite3.connect(os.path.join(self.tmp_dir.name, "keys.db"))
+        self.db.execute("PRAGMA journal_mode = OFF")
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute("CREATE TABLE keys (digest BLOB PRIMARY KEY, "
+                        "seq INTEGER, offset INTEGER)")
+        self.db.execute("CREATE TABLE offsets (seq INTEGER, offset INTEGER)")
+
+        # 字典按插入顺序遍历，序号即第一次出现的顺序
+        if self.keep == "first":
+            self.db.executemany("INSERT INTO keys VALUES (?, ?, NULL)",
+                                ((d, i) for i, d in enumerate(self.keys)))
+        else:
+            self.db.executemany(
+                "INSERT INTO keys VALUES (?, ?, ?)",
+                ((d, i, o[-1]) for i, (d, o) in enumerate(self.keys.items())))
+            if self.keep == "all":
+                self.db.executemany(
+                    "INSERT INTO offsets VALUES (?, ?)",
+                    ((i, offset)
+                     for i, offsets in enumerate(self.keys.values())
+                     for offset in offsets))
+        self.seq = len(self.keys)
+        self.keys = None
+        self.size = 0
+
+    def _add_db(self, digest: bytes, offset: int) -> bool:
+        cursor = self.db.execute("INSERT OR IGNORE INTO keys VALUES (?, ?, ?)",
+                                 (digest, self.seq, offset))
+        new = cursor.rowcount == 1
+        if self.keep == "last" and not new:
+            self.db.execute("UPDATE keys SET offset = ? WHERE digest = ?",
+                            (offset, digest))
+        elif self.keep == "all":
+            seq = self.seq
+            if not new:
+                seq, = self.db.execute("SELECT seq FROM keys WHERE digest = ?",
+                                       (digest, )).fetchone()
+            self.db.execute("INSERT INTO offsets VALUES (?, ?)", (seq, offset))
+        return new
+
+    def __iter__(self) -> Iterator[List[int]]:
+        """按第一次出现的顺序遍历每个键的偏移
+
+        Yields:
+            List[int]: keep 为 "last" 时只有最后一次的偏移，为 "all" 时按出现顺序
+                给出全部偏移
+        """
+        if self.db is None:
+            yield from self.keys.values()
+            return
+
+        if self.keep == "last":
+            self.db.execute("CREATE INDEX keys_seq ON keys (seq)")
+            for offset, in self.db.execute(
+                    "SELECT offset FROM keys ORDER BY seq"):
+                yield [offset]
+            return
 
-    return blocks
+        self.db.execute("CREATE INDEX offsets_seq ON offsets (seq)")
+        current, offsets = None, []
+        for seq, offset in self.db.execute(
+                "SELECT seq, offset FROM offsets ORDER BY seq, rowid"):
+            if seq != current and offsets:
+                yield offsets
+                offsets = []
+            current = seq
+            offsets.append(offset)
+        if offsets:
+            yield offsets
+
+    def close(self) -> None:
+        """删除 SQLite 临时库"""
+        if self.db is not None:
+            self.db.close()
+            self.tmp_dir.cleanup()
+            self.db = None
+
+
+def convert_dedup(in_path: str,
+                  out_path: str,
+                  policy: str = "first",
+                  budget: int = 256 << 20) -> int:
+    """文本转 csv，重复的键只写一行，行按键第一次出现的顺序排列
+
+    first 在第一遍中直接写出；last 和 concat 第一遍只记录每个键的块偏移，
+    第二遍按偏移回读块再写出。内存中只有键的哈希和偏移，超出预算时转存到
+    SQLite，多 GB 的输入也不会耗尽内存。
+
+    Args:
+        in_path (str): 文本路径
+        out_path (str): csv 路径
+        policy (str, optional): "first" 保留第一次的值，"last" 保留最后一次的值，
+            "concat" 按出现顺序用换行连接所有值. 默认为 "first".
+        budget (int, optional): 索引的内存预算字节数. 默认为 256 MiB.
+
+    Returns:
+        int: 写出的行数
+    """
+    keep = {"first": "first", "last": "last", "concat": "all"}[policy]
+    index = KeyIndex(keep, budget)
+    count = 0
+    try:
+        with open(in_path, "rb") as in_file, \
+                open(out_path, "w", encoding="utf-8", newline="") as file_obj:
+            writer = csv.writer(file_obj, **CSV_PARAMS)
+            for offset, block in iter_blocks_at(in_file):
+                if index.add(block[0], offset) and policy == "first":
+                    writer.writerow((block[0], "".join(block[1:])))
+                    count += 1
+            if policy == "first":
+                return count
+
+            for offsets in index:
+                values = []
+                for offset in offsets:
+                    in_file.seek(offset)
+                    _, block = next(iter_blocks_at(in_file))
+                    values.append("".join(block[1:]))
+                writer.writerow((block[0], "\n".join(values)))
+                count += 1
+    finally:
+        index.close()
+    return count
+
+
+def split_chunks(buffer, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """把文本切成约 chunk_size 字节的块，切点都在空行之后，不会切断块
+
+    Args:
+        buffer: mmap 或 bytes
+        chunk_size (int): 每块的目标字节数
+
+    Yields:
+        Tuple[int, int]: (起点, 终点)
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        match = BLANK_LINE.search(buffer, min(start + chunk_size, size))
+        end = match.end() if match else size
+        yield start, end
+        start = end
+
+
+def convert_chunk(in_path: str, start: int, end: int) -> Tuple[str, int]:
+    """把文本的一块转为 csv 文本，供子进程调用
+
+    Args:
+        in_path (str): 文本路径
+        start (int): 块起点，须在空行之后
+        end (int): 块终点，须在空行之后
+
+    Returns:
+        Tuple[str, int]: (csv 文本, 行数)
+    """
+    with open(in_path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+
+    # newline=None 与文本方式打开文件一样识别 \r\n 和 \r
+    lines = io.StringIO(text, newline=None)
+    out = io.StringIO(newline="")
+    writer = csv.writer(out, **CSV_PARAMS)
+    count = 0
+    for block in iter_blocks(lines):
+        writer.writerow((block[0], "".join(block[1:])))
+        count += 1
+    return out.getvalue(), count
+
+
+def convert_parallel(in_path: str,
+                     out_path: str,
+                     jobs: int = None,
+                     chunk_size: int = 4 << 20) -> int:
+    """文本转 csv，输入用 mmap 映射后在空行处切块，块交给进程池解析，
+    结果按原顺序写出，与 convert 的输出相同
+
+    同时在途的块数有上限，内存不随文件大小增长。
+
+    Args:
+        in_path (str): 文本路径
+        out_path (str): csv 路径
+        jobs (int, optional): 进程数，为 1 时在当前进程转换. 默认为 CPU 核数.
+        chunk_size (int, optional): 每块的字节数. 默认为 4 MiB.
+
+    Returns:
+        int: 写出的行数
+    """
+    count = 0
+    with open(in_path, "rb") as in_file, \
+            open(out_path, "w", encoding="utf-8", newline="") as file_obj:
+        # 空文件无法映射
+        if os.fstat(in_file.fileno()).st_size == 0:
+            return 0
+
+        with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            chunks = split_chunks(buffer, chunk_size)
+
+            if jobs == 1:
+                for start, end in chunks:
+                    text, rows = convert_chunk(in_path, start, end)
+                    file_obj.write(text)
+                    count += rows
+                return count
+
+            jobs = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                pending = deque()
+                for start, end in chunks:
+                    pending.append(
+                        executor.submit(convert_chunk, in_path, start, end))
+                    if len(pending) >= jobs * 2:
+                        text, rows = pending.popleft().result()
+                        file_obj.write(text)
+                        count += rows
+                while pending:
+                    text, rows = pending.popleft().result()
+                    file_obj.write(text)
+                    count += rows
+    return count
+
+
+def check_num(value: str) -> int:
+    """验证值在允许范围内,要求大于0。
+
+    Args:
+        value (str): 要验证的整数。
+
+    Raises:
+        argparse.ArgumentTypeError: 如果值超出了允许范围抛出。
+
+    Returns:
+        int: 范围内的有效整数。
+    """
+    value = int(value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(
+            f"{value} is an invalid value,must be greater than 0")
+    return value
 
 
 def get_parameter() -> argparse.Namespace:
@@ -89,35 +497,43 @@ def get_parameter() -> argparse.Namespace:
                         help="increase output version")
     parser.add_argument("-ip", "--in_path", help="input file path")
     parser.add_argument("-op", "--ont_path", help="out file path")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=check_num,
+                        help="parse blank-line separated chunks in this many "
+                        "processes, requires --dedup none")
+    parser.add_argument("--dedup",
+                        choices=["first", "last", "concat", "none"],
+                        default="last",
+                        help="write one row per question, keeping the first "
+                        "or last answer or joining all answers with newlines; "
+                        "none writes every block as its own row "
+                        "(default: last)")
+    parser.add_argument("--max-memory",
+                        type=check_num,
+                        default=256,
+                        help="MiB of key index kept in memory for --dedup "
+                        "before spilling to SQLite (default: 256)")
 
     args = parser.parse_args()
+    if args.dedup != "none" and args.jobs:
+        parser.error("--jobs requires --dedup none")
 
     return args
 
 
 if __name__ == "__main__":
-    csv_params = {
-        "delimiter": ",",
-        "quotechar": '"',
-        "quoting": csv.QUOTE_ALL,
-    }
-
     args = get_parameter()
 
     if args.version:
         get_version()
         sys.exit(0)
 
-    ont_path = ''
-    if not args.ont_path:
-        ont_path = args.in_path + ".csv"
-
-    parsed_blocks = parse_blocks(args.in_path)
-    data = {}
-    for block in parsed_blocks:
-        data[block[0]] = "".join(block[1:])
-
-    with open(ont_path, "w", encoding="utf-8") as file_obj:
-        writer = csv.writer(file_obj, **csv_params)
-        for row in data.items():
-            writer.writerow(row)
+    ont_path = args.ont_path or args.in_path + ".csv"
+    if args.dedup != "none":
+        convert_dedup(args.in_path, ont_path, args.dedup,
+                      args.max_memory << 20)
+    elif args.jobs:
+        convert_parallel(args.in_path, ont_path, args.jobs)
+    else:
+        convert(args.in_path, ont_path)
@@ -0,0 +1,107 @@
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.csv_to_json import convert_ndjson  # noqa: E402
+
+headers = ["id", "name", "city", "score", "note"]
+
+# 非引号字段里的引号是普通字符，切块时不能把它算作引号字段的开始
+regression_text = 'name,desc\nTV,55" screen\nlamp,"warm\nwhite"\nfan,quiet\n'
+
+random.seed(0)
+
+
+def generate(path: str, rows: int) -> None:
+    """生成 csv，部分字段带引号内的换行
+
+    Args:
+        path (str): 输出路径
+        rows (int): 行数
+    """
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(headers)
+        for i in range(rows):
+            note = random.choice(["plain", "with, comma", 'say "hi"',
+                                  "multi\nline", "中文备注"])
+            writer.writerow([i, f"name-{i}", f"city-{i % 97}",
+                             f"{random.random():.4f}", note])
+
+
+def check_boundaries(root: str, text: str) -> None:
+    """在每个切块大小下比较 ndjson 输出和 DictReader 的结果"""
+    in_file = os.path.join(root, "regression.csv")
+    out_file = os.path.join(root, "regression.ndjson")
+    with open(in_file, "w", newline="", encoding="utf-8") as csv_file:
+        csv_file.write(text)
+    with open(in_file, newline="", encoding="utf-8") as csv_file:
+        expected = [
+            json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+            for row in csv.DictReader(csv_file)
+        ]
+    for chunk_size in range(1, len(text.encode("utf-8")) + 2):
+        convert_ndjson(in_file, out_file, jobs=1, chunk_size=chunk_size)
+        with open(out_file, encoding="utf-8") as f:
+            output = f.read().splitlines()
+        assert output == expected, f"chunk_size={chunk_size} 时切断了记录"
+
+
+def get_parameter() -> argparse.Namespace:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        prog="bench_csv_to_json",
+        description="Generate a csv file and benchmark csv_to_json's ndjson "
+        "output across worker counts.")
+    parser.add_argument("-r",
+                        "--rows",
+                        type=int,
+                        default=500000,
+                        help="number of rows in the generated file")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=int,
+                        nargs="+",
+                        default=sorted({1, cpu_count} |
+                                       {2**i for i in range(
+                                           cpu_count.bit_length())}),
+                        help="worker counts to run")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_parameter()
+
+    with tempfile.TemporaryDirectory() as root:
+        check_boundaries(root, regression_text)
+
+        in_file = os.path.join(root, "bench.csv")
+        generate(in_file, args.rows)
+        print(f"文件大小 {os.path.getsize(in_file) / 2**20:.1f} MiB，"
+              f"CPU 核数 {os.cpu_count()}")
+
+        baseline = None
+        base_seconds = None
+        for jobs in args.jobs:
+            out_file = os.path.join(root, f"bench_{jobs}.ndjson")
+            start = time.perf_counter()
+            rows = convert_ndjson(in_file, out_file, jobs=jobs,
+                                  chunk_size=1 << 20)
+            elapsed = time.perf_counter() - start
+
+            with open(out_file, "rb") as f:
+                output = f.read()
+            os.remove(out_file)
+            if baseline is None:
+                baseline, base_seconds = output, elapsed
+            assert output == baseline, f"jobs={jobs} 的输出与串行结果不一致"
+
+            print(f"jobs={jobs:<3} rows={rows:<8} {elapsed:.3f}s "
+                  f"speedup={base_seconds / elapsed:.2f}x")
@@ -0,0 +1,137 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fibonacci import (  # noqa: E402
+    fib, generate_fibonacci_numbers, summarize_int, write_fibonacci)
+
+
+class CountingWriter(io.TextIOBase):
+    """只统计字符数的输出流，避免输出本身占用内存"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        return len(text)
+
+
+def run_list_loop(n: int) -> int:
+    return len(generate_fibonacci_numbers(n))
+
+
+def run_iterative(n: int) -> int:
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return summarize_int(a)[0]
+
+
+def run_fast_doubling(n: int) -> int:
+    return summarize_int(fib(n))[0]
+
+
+def run_matrix(n: int) -> int:
+    # [[F(k+1), F(k)], [F(k), F(k-1)]] 的快速幂
+    result = (1, 0, 0, 1)
+    base = (1, 1, 1, 0)
+    while n:
+        if n & 1:
+            result = mat_mul(result, base)
+        base = mat_mul(base, base)
+        n >>= 1
+    return summarize_int(result[1])[0]
+
+
+def mat_mul(x: tuple, y: tuple) -> tuple:
+    a, b, c, d = x
+    e, f, g, h = y
+    return (a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h)
+
+
+def run_streaming(n: int) -> int:
+    out = CountingWriter()
+    write_fibonacci(n, out=out)
+    return out.size
+
+
+# 变体: (函数, 可测的最大 n)，列表循环受限于 int 转 str 的 4300 位上限
+variants = {
+    "list_loop": (run_list_loop, 20000),
+    "iterative": (run_iterative, 200000),
+    "fast_doubling": (run_fast_doubling, None),
+    "matrix": (run_matrix, None),
+    "streaming": (run_streaming, 20000),
+}
+
+
+def measure(func, n: int) -> dict:
+    start = time.perf_counter()
+    output_size = func(n)
+    seconds = time.perf_counter() - start
+
+    # 单独再跑一次测峰值内存，tracemalloc 会拖慢计时
+    tracemalloc.start()
+    func(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak, "output_size": output_size}
+
+
+def get_parameter() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="bench_fibonacci",
+        description="Benchmark the Fibonacci strategies across n.")
+    parser.add_argument("-n",
+                        "--sizes",
+                        type=int,
+                        nargs="+",
+                        default=[1000, 5000, 20000, 100000, 1000000],
+                        help="values of n to run")
+    parser.add_argument("--variants",
+                        nargs="+",
+                        choices=list(variants),
+                        default=list(variants),
+                        help="strategies to run")
+    parser.add_argument("-of",
+                        "--out_file",
+                        default="bench_fibonacci.json",
+                        help="JSON results file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_parameter()
+    results = []
+
+    print(f"{'variant':<14} {'n':>9} {'seconds':>10} {'peak':>12} {'output':>10}")
+    for name in args.variants:
+        func, limit = variants[name]
+        for n in args.sizes:
+            if limit is not None and n > limit:
+                continue
+            result = {"variant": name, "n": n, **measure(func, n)}
+            results.append(result)
+            print(f"{name:<14} {n:>9} {result['seconds']:>10.4f} "
+                  f"{result['peak_bytes']:>12,} {result['output_size']:>10,}")
+
+    with open(args.out_file, "w", encoding="utf-8") as file_obj:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            },
+            file_obj,
+            indent=4)
+    print(f"结果已保存在 {args.out_file} 中。")
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import time
+import random
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.json_to_yaml import YAML_BACKEND  # noqa: E402
+
+# 校验往返结果用的 Loader，与被测模块一样优先使用 libyaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# 生成文档的记录数和嵌套深度
+num_of_records = 1000
+depth = 3
+
+random.seed(0)
+
+
+def generate(level: int = 0):
+    if level == depth:
+        return random.choice(
+            [random.randint(0, 10**6),
+             random.random(), "value", None, True])
+    return {
+        "id": random.randint(0, 10**6),
+        "name": f"item-{random.randint(0, 999)}",
+        "tags": ["alpha", "beta", "gamma"][:random.randint(0, 3)],
+        "child": generate(level + 1),
+        "items": [generate(level + 1) for _ in range(2)],
+    }
+
+
+data = [generate() for _ in range(num_of_records)]
+size = len(json.dumps(data))
+print(f"文档大小 {size / 2**20:.1f} MiB，当前后端 {YAML_BACKEND}")
+
+dumpers = [("pure-python", yaml.Dumper)]
+if yaml.__with_libyaml__:
+    dumpers.append(("libyaml", yaml.CDumper))
+
+outputs = []
+for name, dumper in dumpers:
+    start = time.perf_counter()
+    text = yaml.dump(data, Dumper=dumper, sort_keys=False)
+    elapsed = time.perf_counter() - start
+    outputs.append(text)
+    print(f"{name:<12} {elapsed:.3f}s  {size / 2**20 / elapsed:.2f} MiB/s")
+
+assert all(text == outputs[0] for text in outputs), "两种后端的输出不一致"
+assert yaml.load(outputs[-1], Loader=SafeLoader) == data
@@ -0,0 +1,132 @@
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tree import tree  # noqa: E402
+
+
+def generate(root: str, width: int, depth: int, files: int,
+             level: int = 0) -> None:
+    """生成 width 叉、depth 层的目录，每个目录下 files 个文件"""
+    for i in range(files):
+        with open(os.path.join(root, f"file_{i}.txt"), "w") as f:
+            f.write("x" * i)
+    if level == depth:
+        return
+    for i in range(width):
+        sub = os.path.join(root, f"dir_{i}")
+        os.mkdir(sub)
+        generate(sub, width, depth, files, level + 1)
+
+
+def recursive_tree(directory: str) -> None:
+    """改为显式栈和线程池之前的递归遍历，作为对照"""
+
+    def inner(dir_path: str, level: int = 0):
+        for entry in os.scandir(dir_path):
+            if entry.is_dir(follow_symlinks=False):
+                indent = "  " * level
+                print(f"{indent}{entry.name}/")
+                inner(entry.path, level + 1)
+            elif entry.is_file():
+                indent = "  " * level
+                print(f"{indent}{entry.name}")
+
+    inner(directory)
+
+
+@contextlib.contextmanager
+def scandir_delay(seconds: float):
+    """给每次 os.scandir 加上固定延迟，模拟网络文件系统的往返
+
+    Args:
+        seconds (float): 每次调用的延迟秒数，为 0 时不做改动
+    """
+    if not seconds:
+        yield
+        return
+
+    scandir = os.scandir
+
+    def delayed(path="."):
+        # sleep 会释放 GIL，和真实的网络等待一样可以被其他线程重叠
+        time.sleep(seconds)
+        return scandir(path)
+
+    os.scandir = delayed
+    try:
+        yield
+    finally:
+        os.scandir = scandir
+
+
+def get_parameter() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="bench_tree",
+        description="Generate a directory tree and benchmark tree.py's "
+        "walker against the original recursive one.")
+    parser.add_argument("-w",
+                        "--width",
+                        type=int,
+                        default=6,
+                        help="subdirectories per directory")
+    parser.add_argument("-d",
+                        "--depth",
+                        type=int,
+                        default=4,
+                        help="levels of subdirectories")
+    parser.add_argument("-f",
+                        "--files",
+                        type=int,
+                        default=20,
+                        help="files per directory")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=int,
+                        nargs="+",
+                        default=[1, 4, 16],
+                        help="thread counts to run")
+    parser.add_argument("--delay",
+                        type=float,
+                        default=0,
+                        help="milliseconds added to every os.scandir call "
+                        "to simulate a network filesystem round trip")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_parameter()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate(root, args.width, args.depth, args.files)
+        print(f"scandir 延迟 {args.delay:g} ms")
+
+        variants = [("recursive", lambda: recursive_tree(root))]
+        for jobs in args.jobs:
+            variants.append((f"jobs={jobs}",
+                             lambda jobs=jobs: tree(root, jobs=jobs)))
+
+        baseline = None
+        base_seconds = None
+        with scandir_delay(args.delay / 1000):
+            for name, run in variants:
+                buffer = io.StringIO()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(buffer):
+                    run()
+                elapsed = time.perf_counter() - start
+
+                output = buffer.getvalue()
+                if baseline is None:
+                    baseline, base_seconds = output, elapsed
+                assert output == baseline, f"{name} 的输出与递归遍历不一致"
+
+                lines = output.count("\n")
+                print(f"{name:<10} entries={lines:<8} {elapsed:.3f}s "
+                      f"speedup={base_seconds / elapsed:.2f}x")
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.txt_to_csv import convert, convert_parallel  # noqa: E402
+
+random.seed(0)
+
+subjects = ["Redis", "MySQL", "Kafka", "Nginx", "Python", "Linux", "Docker"]
+topics = ["内存淘汰机制", "连接池", "持久化", "主从复制", "索引", "事务隔离级别"]
+
+
+def generate(path: str, size: int) -> int:
+    """生成以空行分隔的问答文本，每块一行问题、一到三行答案
+
+    Args:
+        path (str): 输出路径
+        size (int): 目标字节数
+
+    Returns:
+        int: 块数
+    """
+    blocks = 0
+    written = 0
+    with open(path, "w", encoding="utf-8") as file_obj:
+        while written < size:
+            subject = random.choice(subjects)
+            topic = random.choice(topics)
+            lines = [f"{subject} 的{topic}是什么？（{blocks}）"]
+            for _ in range(random.randint(1, 3)):
+                lines.append(f"{subject} 的{topic}包括：\"LRU\"、LFU，"
+                             f"以及 {random.randint(0, 10**6)} 种其他情况。")
+            text = "\n".join(lines) + "\n" * random.randint(2, 3)
+            file_obj.write(text)
+            written += len(text.encode("utf-8"))
+            blocks += 1
+    return blocks
+
+
+def get_parameter() -> argparse.Namespace:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        prog="bench_txt_to_csv",
+        description="Generate a blank-line separated Q&A file and benchmark "
+        "txt_to_csv across worker counts.")
+    parser.add_argument("-s",
+                        "--size",
+                        type=int,
+                        default=100,
+                        help="size of the generated file in MiB")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=int,
+                        nargs="+",
+                        default=sorted({1, cpu_count} |
+                                       {2**i for i in range(
+                                           cpu_count.bit_length())}),
+                        help="worker counts to run")
+    parser.add_argument("-if",
+                        "--in_file",
+                        help="reuse or keep the generated file at this path")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_parameter()
+
+    with tempfile.TemporaryDirectory() as root:
+        in_file = args.in_file or os.path.join(root, "bench.txt")
+        if not os.path.exists(in_file):
+            blocks = generate(in_file, args.size * 2**20)
+            print(f"已生成 {blocks:,} 个块")
+        size = os.path.getsize(in_file) / 2**20
+        print(f"文件大小 {size:.1f} MiB，CPU 核数 {os.cpu_count()}")
+
+        out_file = os.path.join(root, "serial.csv")
+        start = time.perf_counter()
+        rows = convert(in_file, out_file)
+        serial = time.perf_counter() - start
+        with open(out_file, "rb") as f:
+            baseline = f.read()
+        print(f"serial   rows={rows:<9} {serial:.3f}s {size / serial:.1f} MiB/s")
+
+        for jobs in args.jobs:
+            out_file = os.path.join(root, f"jobs_{jobs}.csv")
+            start = time.perf_counter()
+            convert_parallel(in_file, out_file, jobs)
+            elapsed = time.perf_counter() - start
+
+            with open(out_file, "rb") as f:
+                assert f.read() == baseline, f"jobs={jobs} 的输出与串行结果不一致"
+            os.remove(out_file)
+            print(f"jobs={jobs:<3} rows={rows:<9} {elapsed:.3f}s "
+                  f"{size / elapsed:.1f} MiB/s speedup={serial / elapsed:.2f}x")